@@ -0,0 +1,43 @@
+from logging.config import fileConfig
+from alembic import context
+from app.core.config import settings
+from app.db.base import Base
+from app.db.session import build_engine
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+def _url():
+    return config.attributes.get("url") or settings.SQLALCHEMY_DATABASE_URI
+
+def run_migrations_offline():
+    # Emits SQL instead of executing it: alembic upgrade head --sql
+    context.configure(
+        url=_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=_url().startswith("sqlite")
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    engine = build_engine(_url(), profile="default")
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite cannot ALTER most column properties in place
+            render_as_batch=connection.dialect.name == "sqlite"
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+    engine.dispose()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,71 @@
+"""json columns
+
+Stores interests, preferences and chat/game metadata as JSON (JSONB on
+Postgres). Rows written before this revision hold Python reprs such as
+"['music']", so they are rewritten as JSON first.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 08:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import ast
+import json
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = [
+    ("users", "interests"),
+    ("user_preferences", "preferences"),
+    ("chat_history", "metadata"),
+    ("game_scores", "metadata"),
+]
+
+def _to_json(value):
+    try:
+        json.loads(value)
+        return value
+    except ValueError:
+        pass
+    try:
+        return json.dumps(ast.literal_eval(value))
+    except (ValueError, SyntaxError):
+        # Free text: keep it, as a JSON string
+        return json.dumps(value)
+
+def _convert_rows(bind, table, column):
+    t = sa.table(table, sa.column("id", sa.Integer), sa.column(column, sa.Text))
+    rows = bind.execute(sa.select(t.c.id, t.c[column]).where(t.c[column].is_not(None))).fetchall()
+    for row_id, value in rows:
+        converted = _to_json(value)
+        if converted != value:
+            bind.execute(t.update().where(t.c.id == row_id).values({column: converted}))
+
+def upgrade():
+    bind = op.get_bind()
+    for table, column in JSON_COLUMNS:
+        # --sql (offline) mode cannot read rows, so only the type change is emitted
+        if not op.get_context().as_sql:
+            _convert_rows(bind, table, column)
+
+        if bind.dialect.name == "postgresql":
+            op.alter_column(table, column, type_=postgresql.JSONB(),
+                            postgresql_using=f'"{column}"::jsonb')
+        else:
+            # SQLite keeps JSON as TEXT, only the declared type changes
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.alter_column(column, type_=sa.JSON())
+
+def downgrade():
+    bind = op.get_bind()
+    for table, column in JSON_COLUMNS:
+        if bind.dialect.name == "postgresql":
+            op.alter_column(table, column, type_=sa.Text(), postgresql_using=f'"{column}"::text')
+        else:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.alter_column(column, type_=sa.Text())
@@ -0,0 +1,38 @@
+"""hot path indexes
+
+Composite indexes for the history/list access paths (filter by user,
+order by created_at) and an index on refresh_tokens.token_hash. The
+single-column user_id indexes they supersede are dropped.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 08:30:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # New indexes first, so the hot queries are never without one
+    op.create_index('ix_mood_history_user_id_created_at', 'mood_history', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_chat_history_user_id_session_id_created_at', 'chat_history', ['user_id', 'session_id', 'created_at'], unique=False)
+    op.create_index('ix_journal_user_id_created_at', 'journal', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_refresh_tokens_token_hash', 'refresh_tokens', ['token_hash'], unique=False)
+
+    op.drop_index('ix_mood_history_user_id', table_name='mood_history')
+    op.drop_index('ix_chat_history_user_id', table_name='chat_history')
+    op.drop_index('ix_journal_user_id', table_name='journal')
+
+def downgrade():
+    op.create_index('ix_journal_user_id', 'journal', ['user_id'], unique=False)
+    op.create_index('ix_chat_history_user_id', 'chat_history', ['user_id'], unique=False)
+    op.create_index('ix_mood_history_user_id', 'mood_history', ['user_id'], unique=False)
+
+    op.drop_index('ix_refresh_tokens_token_hash', table_name='refresh_tokens')
+    op.drop_index('ix_journal_user_id_created_at', table_name='journal')
+    op.drop_index('ix_chat_history_user_id_session_id_created_at', table_name='chat_history')
+    op.drop_index('ix_mood_history_user_id_created_at', table_name='mood_history')
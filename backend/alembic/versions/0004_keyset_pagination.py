@@ -0,0 +1,30 @@
+"""keyset pagination
+
+History endpoints page on (created_at, id). SQLite compares timestamps
+as text, so rows stored by the CURRENT_TIMESTAMP server default
+("YYYY-MM-DD HH:MM:SS") are rewritten in the format SQLAlchemy binds
+("YYYY-MM-DD HH:MM:SS.ffffff"). Chat history across all sessions gets
+its own (user_id, created_at) index.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 09:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+PAGINATED_TABLES = ["mood_history", "chat_history", "journal"]
+
+def upgrade():
+    if op.get_bind().dialect.name == "sqlite":
+        for table in PAGINATED_TABLES:
+            op.execute(f"UPDATE {table} SET created_at = created_at || '.000000' WHERE length(created_at) = 19")
+    op.create_index('ix_chat_history_user_id_created_at', 'chat_history', ['user_id', 'created_at'], unique=False)
+
+def downgrade():
+    op.drop_index('ix_chat_history_user_id_created_at', table_name='chat_history')
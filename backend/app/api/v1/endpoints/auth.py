@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from datetime import timedelta
 from pydantic import BaseModel
 
-from app.db.session import SessionLocal
+from app.db.session import get_db
 from app.core import security, config
 from app.models.user import User
 from app.models.token import RefreshToken
@@ -13,12 +13,9 @@ from app.schemas.user import UserCreate, UserLogin, Token
 settings = config.settings
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def refresh_token_query(db: Session, token_hash: str):
+    # Shared by refresh and logout; also compiled by test_query_plans.py
+    return db.query(RefreshToken).filter(RefreshToken.token_hash == token_hash)
 
 class RefreshRequest(BaseModel):
     refresh_token: str
@@ -39,7 +36,7 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
         email=user_in.email,
         username=user_in.username,
         password_hash=security.get_password_hash(user_in.password),
-        interests=str(user_in.interests) # simplify for now
+        interests=user_in.interests
     )
     db.add(user)
     db.commit()
@@ -106,7 +103,7 @@ def login(login_req: UserLogin, db: Session = Depends(get_db)):
 @router.post("/refresh", response_model=Token)
 def refresh_token(req: RefreshRequest, db: Session = Depends(get_db)):
     # Verify token exists in DB and is valid
-    db_token = db.query(RefreshToken).filter(RefreshToken.token_hash == req.refresh_token).first()
+    db_token = refresh_token_query(db, req.refresh_token).first()
     if not db_token:
         raise HTTPException(status_code=401, detail="Invalid refresh token")
         
@@ -130,7 +127,7 @@ def refresh_token(req: RefreshRequest, db: Session = Depends(get_db)):
 @router.post("/logout")
 def logout(req: LogoutRequest, db: Session = Depends(get_db)):
     # Revoke token
-    db.query(RefreshToken).filter(RefreshToken.token_hash == req.refresh_token).delete()
+    refresh_token_query(db, req.refresh_token).delete()
     db.commit()
     return {"ok": True}
 
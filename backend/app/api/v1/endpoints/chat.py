@@ -1,22 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Optional
 from datetime import datetime
 import uuid
 
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal, get_async_db, get_async_read_db
 from app.models.chat import ChatHistory
 from app.services.chat_agent import chat_agent
+from app.core.streaming import sse_event
+from app.core.pagination import Page, keyset_desc, keyset_page
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def history_query(user_id: int, session_id: Optional[str], cursor: Optional[str], limit: int):
+    # Also compiled by test_query_plans.py
+    query = select(ChatHistory).where(ChatHistory.user_id == user_id)
+    if session_id:
+        query = query.where(ChatHistory.session_id == session_id)
+    return keyset_desc(query, ChatHistory, cursor, limit)
 
 class MessageIn(BaseModel):
     user_id: int
@@ -35,41 +39,62 @@ class ChatResponse(BaseModel):
     reply: str
     session_id: str
 
+async def _save_message(db: AsyncSession, user_id: int, session_id: str, role: str, message: str):
+    entry = ChatHistory(
+        user_id=user_id,
+        session_id=session_id,
+        role=role,
+        message=message,
+        created_at=datetime.utcnow()
+    )
+    db.add(entry)
+    await db.commit()
+
 @router.post("/send", response_model=ChatResponse)
-def send_message(msg: MessageIn, db: Session = Depends(get_db)):
+async def send_message(msg: MessageIn, db: AsyncSession = Depends(get_async_db)):
     sid = msg.session_id or str(uuid.uuid4())
     
     # 1. Save user message
-    user_entry = ChatHistory(
-        user_id=msg.user_id,
-        session_id=sid,
-        role="user",
-        message=msg.message,
-        created_at=datetime.utcnow()
-    )
-    db.add(user_entry)
-    db.commit()
+    await _save_message(db, msg.user_id, sid, "user", msg.message)
     
     # 2. Agent Logic
-    response_text = chat_agent.generate_response(msg.message)
+    response_text = await chat_agent.generate_response(msg.message)
     
     # 3. Save AI message
-    ai_entry = ChatHistory(
-        user_id=msg.user_id,
-        session_id=sid,
-        role="assistant",
-        message=response_text,
-        created_at=datetime.utcnow()
-    )
-    db.add(ai_entry)
-    db.commit()
+    await _save_message(db, msg.user_id, sid, "assistant", response_text)
     
     return {"reply": response_text, "session_id": sid}
 
-@router.get("/history", response_model=List[MessageOut])
-def get_history(user_id: int, session_id: Optional[str] = None, limit: int = 50, db: Session = Depends(get_db)):
-    query = db.query(ChatHistory).filter(ChatHistory.user_id == user_id)
-    if session_id:
-        query = query.filter(ChatHistory.session_id == session_id)
-    
-    return query.order_by(ChatHistory.created_at.asc()).limit(limit).all()
+@router.post("/send/stream")
+async def send_message_stream(msg: MessageIn, db: AsyncSession = Depends(get_async_db)):
+    """
+    Streams the reply as Server-Sent Events: one 'data: {"delta": ...}' frame
+    per chunk, then a 'done' event with the full reply and session id.
+    """
+    sid = msg.session_id or str(uuid.uuid4())
+    await _save_message(db, msg.user_id, sid, "user", msg.message)
+
+    async def stream_reply():
+        parts = []
+        async for delta in chat_agent.generate_response_stream(msg.message):
+            parts.append(delta)
+            yield sse_event({"delta": delta})
+        reply = "".join(parts).strip()
+
+        # The request's session may already be closed once streaming starts
+        async with AsyncSessionLocal() as stream_db:
+            await _save_message(stream_db, msg.user_id, sid, "assistant", reply)
+        yield sse_event({"reply": reply, "session_id": sid}, event="done")
+
+    return StreamingResponse(stream_reply(), media_type="text/event-stream")
+
+@router.get("/history", response_model=Page[MessageOut])
+async def get_history(user_id: int, session_id: Optional[str] = None, limit: int = Query(50, ge=1, le=200),
+                      cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Most recent messages first in page order, returned oldest-to-newest for
+    display. next_cursor walks back to earlier messages.
+    """
+    result = await db.execute(history_query(user_id, session_id, cursor, limit))
+    items, next_cursor = keyset_page(result.scalars(), limit)
+    return {"items": items[::-1], "next_cursor": next_cursor}
@@ -2,19 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
-from app.db.session import SessionLocal
+from app.db.session import get_db, get_read_db
 from app.models.game import GameScore
 from datetime import datetime
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 class GameStart(BaseModel):
     user_id: int
     difficulty: str
@@ -38,7 +31,7 @@ def start_game(game_name: str, item: GameStart):
 @router.post("/{game_name}/submit")
 def submit_score(game_name: str, item: ScoreSubmit, db: Session = Depends(get_db)):
     score_val = item.result.get("score", 0)
-    meta = str(item.result)
+    meta = item.result
     
     gs = GameScore(
         user_id=item.user_id,
@@ -53,7 +46,7 @@ def submit_score(game_name: str, item: ScoreSubmit, db: Session = Depends(get_db
     return {"success": True, "score": score_val}
 
 @router.get("/scores/{user_id}")
-def get_user_scores(user_id: int, db: Session = Depends(get_db)):
+def get_user_scores(user_id: int, db: Session = Depends(get_read_db)):
     all_scores = db.query(GameScore).filter(GameScore.user_id == user_id).all()
     best_scores = {}
     
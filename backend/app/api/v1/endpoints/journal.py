@@ -1,20 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Optional
 from pydantic import BaseModel
 from datetime import datetime
 
-from app.db.session import SessionLocal
+from app.db.session import get_db, get_async_db, get_async_read_db
+from app.core.pagination import Page, keyset_desc, keyset_page
 from app.models.journal import Journal
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def list_query(user_id: int, cursor: Optional[str], limit: int):
+    # Also compiled by test_query_plans.py
+    return keyset_desc(select(Journal).where(Journal.user_id == user_id), Journal, cursor, limit)
 
 class JournalCreate(BaseModel):
     user_id: int
@@ -37,7 +37,7 @@ class JournalOut(BaseModel):
         from_attributes = True
 
 @router.post("/create")
-def create_journal(log: JournalCreate, db: Session = Depends(get_db)):
+async def create_journal(log: JournalCreate, db: AsyncSession = Depends(get_async_db)):
     db_log = Journal(
         user_id=log.user_id,
         title=log.title,
@@ -46,13 +46,16 @@ def create_journal(log: JournalCreate, db: Session = Depends(get_db)):
         created_at=datetime.utcnow()
     )
     db.add(db_log)
-    db.commit()
-    db.refresh(db_log)
+    await db.commit()
     return {"id": db_log.id}
 
-@router.get("/list", response_model=List[JournalOut])
-def list_journal(user_id: int, limit: int = 20, offset: int = 0, db: Session = Depends(get_db)):
-    return db.query(Journal).filter(Journal.user_id == user_id).order_by(Journal.created_at.desc()).offset(offset).limit(limit).all()
+@router.get("/list", response_model=Page[JournalOut])
+async def list_journal(user_id: int, limit: int = Query(20, ge=1, le=100), cursor: Optional[str] = None,
+                       db: AsyncSession = Depends(get_async_read_db)):
+    # Newest first; pass next_cursor back to get older entries
+    result = await db.execute(list_query(user_id, cursor, limit))
+    items, next_cursor = keyset_page(result.scalars(), limit)
+    return {"items": items, "next_cursor": next_cursor}
 
 @router.get("/{id}", response_model=JournalOut)
 def get_journal(id: int, db: Session = Depends(get_db)):
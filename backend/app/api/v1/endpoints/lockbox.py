@@ -5,18 +5,11 @@ import base64
 from typing import List
 from datetime import datetime
 
-from app.db.session import SessionLocal
+from app.db.session import get_db, get_read_db
 from app.models.lockbox import Lockbox
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 class LockboxSave(BaseModel):
     user_id: int
     label: str
@@ -47,7 +40,7 @@ def save_lockbox(item: LockboxSave, db: Session = Depends(get_db)):
     return {"id": lb.id}
 
 @router.get("/list", response_model=List[LockboxOut])
-def list_lockbox(user_id: int, db: Session = Depends(get_db)):
+def list_lockbox(user_id: int, db: Session = Depends(get_read_db)):
     # Don't return data, just metadata
     return db.query(Lockbox).filter(Lockbox.user_id == user_id).all()
 
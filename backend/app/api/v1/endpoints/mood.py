@@ -1,20 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+from datetime import datetime
+import asyncio
+import json
+import time
 
-from app.db.session import SessionLocal
+from app.db.session import get_async_db, get_async_read_db
 from app.models.mood import MoodHistory
-from app.schemas.mood import MoodDetectRequest, MoodResponse, MoodLogRequest, MoodHistoryItem
-from app.services.emotion_ai import emotion_analyzer
-from app.api.v1.endpoints.auth import get_db # Reuse dependency
+from app.core.config import settings
+from app.core.pagination import Page, keyset_desc, keyset_page
+from app.schemas.mood import MoodDetectRequest, MoodBatchRequest, MoodResponse, MoodLogRequest, MoodHistoryItem
+from app.services.emotion_ai import emotion_analyzer, InferenceQueueFull
 
 router = APIRouter()
 
-@router.post("/detect", response_model=MoodResponse)
-def detect_mood(request: MoodDetectRequest):
-    # This might take time on first run
-    result = emotion_analyzer.analyze(request.text)
-    
+def history_query(user_id: int, cursor: Optional[str], limit: int):
+    # Also compiled by test_query_plans.py, so the checked plan is the served one
+    return keyset_desc(select(MoodHistory).where(MoodHistory.user_id == user_id), MoodHistory, cursor, limit)
+
+def _to_mood_response(result: dict):
     # Simple heuristic for energy level based on emotion
     energy_map = {
         "joy": "high",
@@ -28,23 +35,90 @@ def detect_mood(request: MoodDetectRequest):
         "mood": result['mood'],
         "emotion": result['emotion'],
         "intensity": result['intensity'],
-        "energy_level": energy
+        "energy_level": energy,
+        "source": result.get('source', "model")
     }
 
+@router.post("/detect", response_model=MoodResponse)
+async def detect_mood(request: MoodDetectRequest):
+    # This might take time on first run
+    try:
+        result = await emotion_analyzer.analyze_async(request.text)
+    except InferenceQueueFull:
+        raise HTTPException(status_code=429, detail="Mood detection is busy, please retry shortly.")
+    return _to_mood_response(result)
+
+@router.post("/detect/batch", response_model=List[MoodResponse])
+async def detect_mood_batch(request: MoodBatchRequest, accept: Optional[str] = Header(None)):
+    """
+    Scores many texts at once. Returns a JSON list of MoodResponse in input
+    order. Clients that send `Accept: application/x-ndjson` get the same
+    objects streamed one per line as each chunk finishes instead.
+    """
+    if "application/x-ndjson" not in (accept or ""):
+        try:
+            results = await emotion_analyzer.analyze_batch_async(request.texts)
+        except InferenceQueueFull:
+            raise HTTPException(status_code=429, detail="Mood detection is busy, please retry shortly.")
+        return [_to_mood_response(r) for r in results]
+
+    chunk_size = max(1, settings.EMOTION_BATCH_CHUNK_SIZE)
+    chunks = [request.texts[i:i + chunk_size] for i in range(0, len(request.texts), chunk_size)]
+    # The first chunk runs before the stream opens, so a saturated executor still gets a 429
+    try:
+        first = await emotion_analyzer.analyze_batch_async(chunks[0]) if chunks else []
+    except InferenceQueueFull:
+        raise HTTPException(status_code=429, detail="Mood detection is busy, please retry shortly.")
+
+    async def stream_results():
+        results = first
+        for n in range(len(chunks)):
+            if n:
+                # Mid-stream the status is already sent: retry for a bounded time, then end with an error line
+                deadline = time.monotonic() + settings.EMOTION_BATCH_RETRY_SECONDS
+                while True:
+                    try:
+                        results = await emotion_analyzer.analyze_batch_async(chunks[n])
+                        break
+                    except InferenceQueueFull:
+                        if time.monotonic() >= deadline:
+                            yield json.dumps({"error": "Mood detection is busy, please retry shortly.",
+                                              "scored": n * chunk_size}) + "\n"
+                            return
+                        await asyncio.sleep(0.05)
+            for result in results:
+                yield json.dumps(_to_mood_response(result)) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+@router.get("/cache/stats")
+def cache_stats():
+    # Hit/miss counters for sizing the emotion cache
+    return emotion_analyzer.cache_stats()
+
+@router.get("/latency/stats")
+def latency_stats():
+    # Request counts and latency per detection path (rules / cache / model)
+    return emotion_analyzer.latency_stats()
+
 @router.post("/log")
-def log_mood(request: MoodLogRequest, user_id: int, db: Session = Depends(get_db)):
+async def log_mood(request: MoodLogRequest, user_id: int, db: AsyncSession = Depends(get_async_db)):
     # Assuming user_id passed (should extract from JWT in real middleware)
     log = MoodHistory(
         user_id=user_id,
         mood=request.mood,
         intensity=request.intensity,
-        activities_used=str(request.activities_used)
+        activities_used=str(request.activities_used),
+        created_at=datetime.utcnow()
     )
     db.add(log)
-    db.commit()
+    await db.commit()
     return {"ok": True, "id": log.id}
 
-@router.get("/history", response_model=List[MoodHistoryItem])
-def get_history(user_id: int, db: Session = Depends(get_db)):
-    logs = db.query(MoodHistory).filter(MoodHistory.user_id == user_id).order_by(MoodHistory.created_at.desc()).limit(20).all()
-    return logs
+@router.get("/history", response_model=Page[MoodHistoryItem])
+async def get_history(user_id: int, limit: int = Query(20, ge=1, le=100), cursor: Optional[str] = None,
+                      db: AsyncSession = Depends(get_async_read_db)):
+    # Newest first; pass next_cursor back to get older entries
+    result = await db.execute(history_query(user_id, cursor, limit))
+    items, next_cursor = keyset_page(result.scalars(), limit)
+    return {"items": items, "next_cursor": next_cursor}
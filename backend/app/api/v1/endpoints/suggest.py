@@ -5,13 +5,15 @@ from app.services.router_agent import router_agent
 router = APIRouter()
 
 @router.post("/", response_model=SuggestionResponse)
-def suggest_plan(request: SuggestionRequest):
+async def suggest_plan(request: SuggestionRequest):
     # Route the request through the Agent Router logic
-    plan_items = router_agent.route(
+    plan_items = await router_agent.route(
         mood_data={
             "mood": request.mood,
             "emotion": request.emotion,
-            "intensity": request.intensity
+            "intensity": request.intensity,
+            "time_available_minutes": request.time_available_minutes,
+            "preferences": request.preferences
         },
         user_id=request.user_id
     )
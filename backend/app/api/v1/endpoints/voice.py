@@ -1,8 +1,12 @@
 from fastapi import APIRouter, File, UploadFile, Form, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List
 import logging
+import json
+import re
 from app.services.llm_service import llm_service
+from app.core.streaming import sse_event
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -13,6 +17,104 @@ class VoiceResponse(BaseModel):
     action: Optional[str] = None
     transcript: str
 
+def _build_prompt(transcript: str, history: Optional[str]):
+    # 1. Build Context from History
+    messages_context = []
+    if history:
+        try:
+            messages_context = json.loads(history)
+        except:
+            pass
+    
+    # Limit history to last 6 turns to keep context usually relevant but not huge
+    messages_context = messages_context[-6:]
+    
+    # Prevent duplication: If the last message in history is the same as the current transcript,
+    # remove it from context because we append the transcript explicitly below.
+    if messages_context and messages_context[-1].get("role") == "user" and messages_context[-1].get("content") == transcript:
+        messages_context.pop()
+
+    # Construct System Prompt
+    system_prompt = (
+        "You are Luno, a compassionate, witty, and helpful AI companion. "
+        "Your goal is to have a natural spoken conversation with the user. "
+        "Keep your responses concise (1-2 sentences) as they will be spoken aloud. "
+        "Listen carefully to what the user says and ask relevant follow-up questions to deepen the conversation. "
+        "Do not change the subject abruptly. Only suggest activities if the user explicitly says they are bored. "
+        "Do not use markdown or emojis in your response. "
+        "IMPORTANT: Do not output any internal tokens like ['OUT'] or <s>."
+    )
+
+    # Merge history into a prompt format that the simple LLM service can handle
+    full_transcript = ""
+    for msg in messages_context:
+        role = "User" if msg.get("role") == "user" else "Luno"
+        content = msg.get("content", "")
+        full_transcript += f"{role}: {content}\n"
+    
+    full_transcript += f"User: {transcript}\nLuno:"
+    return system_prompt, full_transcript
+
+def _infer_mood(transcript: str) -> str:
+    # We can ask LLM to return JSON, but for speed, let's keep it simple text and infer mood
+    mood = "neutral"
+    lower_trans = transcript.lower()
+    if any(w in lower_trans for w in ["sad", "tired", "bored", "lonely"]):
+        mood = "low_energy"
+    elif any(w in lower_trans for w in ["angry", "stressed", "hate"]):
+        mood = "stressed"
+    elif any(w in lower_trans for w in ["happy", "great", "good"]):
+        mood = "happy"
+    return mood
+
+class ReplyCleaner:
+    """
+    Incremental version of the voice reply cleanup. Strips special tokens,
+    quotes, *actions* and [bracketed] text from a token stream, holding back
+    only text that could still turn out to be part of one of those.
+    """
+    def __init__(self):
+        self.buffer = ""
+        self.prefix_checked = False
+        self.at_start = True
+
+    def feed(self, chunk: str) -> str:
+        self.buffer += chunk
+        return self._drain(final=False)
+
+    def flush(self) -> str:
+        return self._drain(final=True)
+
+    def _drain(self, final: bool) -> str:
+        text = self.buffer.replace("<s>", "").replace("</s>", "").replace('"', "").replace("['OUT']", "")
+        text = re.sub(r'\*.*?\*', '', text)
+        text = re.sub(r'\[.*?\]', '', text)
+
+        hold = len(text)
+        if not final:
+            # An unmatched '*' or '[' may still close; a trailing '<' may start a token
+            for opener in ("*", "["):
+                idx = text.find(opener)
+                if idx != -1:
+                    hold = min(hold, idx)
+            idx = text.rfind("<")
+            if idx != -1 and ">" not in text[idx:]:
+                hold = min(hold, idx)
+
+        ready, self.buffer = text[:hold], text[hold:]
+        if not self.prefix_checked:
+            candidate = ready.lstrip()
+            # LLM might repeat "Luno: " -- wait until we can tell
+            if not final and len(candidate) < len("Luno:") and "Luno:".startswith(candidate):
+                self.buffer = ready + self.buffer
+                return ""
+            self.prefix_checked = True
+            ready = candidate[5:] if candidate.startswith("Luno:") else candidate
+        if self.at_start:
+            ready = ready.lstrip()
+            self.at_start = not ready
+        return ready
+
 @router.post("/chat", response_model=VoiceResponse)
 async def voice_chat(
     transcript: str = Form(...),
@@ -22,51 +124,14 @@ async def voice_chat(
     try:
         logger.info(f"Voice chat request: {transcript}")
         
-        # 1. Build Context from History
-        import json
-        messages_context = []
-        if history:
-            try:
-                messages_context = json.loads(history)
-            except:
-                pass
-        
-        # Limit history to last 6 turns to keep context usually relevant but not huge
-        messages_context = messages_context[-6:]
-        
-        # Prevent duplication: If the last message in history is the same as the current transcript,
-        # remove it from context because we append the transcript explicitly below.
-        if messages_context and messages_context[-1].get("role") == "user" and messages_context[-1].get("content") == transcript:
-            messages_context.pop()
-
-        # Construct System Prompt
-        system_prompt = (
-            "You are Luno, a compassionate, witty, and helpful AI companion. "
-            "Your goal is to have a natural spoken conversation with the user. "
-            "Keep your responses concise (1-2 sentences) as they will be spoken aloud. "
-            "Listen carefully to what the user says and ask relevant follow-up questions to deepen the conversation. "
-            "Do not change the subject abruptly. Only suggest activities if the user explicitly says they are bored. "
-            "Do not use markdown or emojis in your response. "
-            "IMPORTANT: Do not output any internal tokens like ['OUT'] or <s>."
-        )
-
-        # Merge history into a prompt format that the simple LLM service can handle
-        full_transcript = ""
-        for msg in messages_context:
-            role = "User" if msg.get("role") == "user" else "Luno"
-            content = msg.get("content", "")
-            full_transcript += f"{role}: {content}\n"
-        
-        full_transcript += f"User: {transcript}\nLuno:"
-        
-        
+        system_prompt, full_transcript = _build_prompt(transcript, history)
+
         # Call LLM
         reply = await llm_service.generate(system_prompt, full_transcript)
         
         # Clean up response (remove special tokens and action descriptions)
         reply = reply.replace("<s>", "").replace("</s>", "").replace('"', "").replace("['OUT']", "").strip()
         # Remove text between asterisks (actions like *smiles*)
-        import re
         reply = re.sub(r'\*.*?\*', '', reply)
         reply = re.sub(r'\[.*?\]', '', reply) # Remove bracketed text like [smiles]
         reply = reply.strip()
@@ -76,15 +141,7 @@ async def voice_chat(
             reply = reply[5:].strip()
 
         # 2. Simple Sentiment Analysis (Mock for now, or lightweight)
-        # We can ask LLM to return JSON, but for speed, let's keep it simple text and infer mood
-        mood = "neutral"
-        lower_trans = transcript.lower()
-        if any(w in lower_trans for w in ["sad", "tired", "bored", "lonely"]):
-            mood = "low_energy"
-        elif any(w in lower_trans for w in ["angry", "stressed", "hate"]):
-            mood = "stressed"
-        elif any(w in lower_trans for w in ["happy", "great", "good"]):
-            mood = "happy"
+        mood = _infer_mood(transcript)
 
         return {
             "reply": reply,
@@ -97,3 +154,43 @@ async def voice_chat(
         logger.error(f"Voice chat error: {e}")
         raise HTTPException(status_code=500, detail="Failed to process voice")
 
+@router.post("/chat/stream")
+async def voice_chat_stream(
+    transcript: str = Form(...),
+    user_id: Optional[str] = Form(None),
+    history: Optional[str] = Form(None)
+):
+    """
+    Streaming variant of /chat for low time-to-first-token. Sends cleaned
+    'data: {"delta": ...}' frames as tokens arrive, then a 'done' event with
+    the full reply and inferred mood.
+    """
+    logger.info(f"Voice chat stream request: {transcript}")
+    system_prompt, full_transcript = _build_prompt(transcript, history)
+
+    async def stream_reply():
+        cleaner = ReplyCleaner()
+        parts = []
+        try:
+            async for token in llm_service.generate_stream(system_prompt, full_transcript):
+                delta = cleaner.feed(token)
+                if delta:
+                    parts.append(delta)
+                    yield sse_event({"delta": delta})
+            delta = cleaner.flush()
+            if delta:
+                parts.append(delta)
+                yield sse_event({"delta": delta})
+        except Exception as e:
+            logger.error(f"Voice chat stream error: {e}")
+            yield sse_event({"detail": "Failed to process voice"}, event="error")
+            return
+
+        yield sse_event({
+            "reply": "".join(parts).strip(),
+            "mood": _infer_mood(transcript),
+            "action": None,
+            "transcript": transcript
+        }, event="done")
+
+    return StreamingResponse(stream_reply(), media_type="text/event-stream")
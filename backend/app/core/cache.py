@@ -0,0 +1,136 @@
+from collections import OrderedDict
+from typing import Any, Optional
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+class SQLiteCacheStore:
+    """
+    On-disk cache tier that survives restarts. Values are stored as JSON,
+    one table shared by every cache and partitioned by namespace.
+    """
+    def __init__(self, path: str, namespace: str):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        self._conn.commit()
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+        if not row:
+            return None
+        value, expires_at = row
+        if expires_at < time.time():
+            self.delete(key)
+            return None
+        return json.loads(value), expires_at
+
+    def set(self, key: str, value: Any, expires_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), expires_at)
+            )
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (self.namespace, key))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+
+class TTLCache:
+    """
+    Thread-safe in-memory LRU cache with per-entry TTL and an optional
+    SQLite tier behind it. Hit/miss counters are kept for sizing.
+    """
+    def __init__(self, max_size: int, ttl_seconds: float, namespace: str = "default", disk_path: Optional[str] = None):
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self.namespace = namespace
+        self.logger = logging.getLogger(__name__)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk = SQLiteCacheStore(disk_path, namespace) if disk_path else None
+
+    def get(self, key: str, default=None):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at >= now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        if self.disk:
+            try:
+                stored = self.disk.get(key)
+            except sqlite3.Error as e:
+                self.logger.error(f"Cache disk read failed ({self.namespace}): {e}")
+                stored = None
+            if stored is not None:
+                value, expires_at = stored
+                with self._lock:
+                    self.disk_hits += 1
+                    self._store(key, value, expires_at)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def set(self, key: str, value: Any):
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._store(key, value, expires_at)
+        if self.disk:
+            try:
+                self.disk.set(key, value, expires_at)
+            except sqlite3.Error as e:
+                self.logger.error(f"Cache disk write failed ({self.namespace}): {e}")
+
+    def _store(self, key: str, value: Any, expires_at: float):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.disk:
+            self.disk.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "namespace": self.namespace,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            }
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Optional, Dict
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Boredom Breaker"
@@ -9,6 +9,37 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
     SQLALCHEMY_DATABASE_URI: str = "sqlite:///./boredom_breaker.db"
+    # "tuned" applies WAL/busy-timeout/mmap pragmas on SQLite connections, "default" leaves them off
+    DB_PROFILE: str = "tuned"
+    # Server databases: connection budget per API process, split evenly across its four engines
+    # (sync/async x write/read). Keep (DB_POOL_SIZE + DB_MAX_OVERFLOW) x processes below max_connections (default 100).
+    DB_POOL_SIZE: int = 32
+    DB_MAX_OVERFLOW: int = 8
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    # Server databases (Postgres): drop dead connections before use, recycle long-lived ones
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # Run Alembic migrations on startup; turn off on replicas and migrate once per deploy
+    DB_AUTO_MIGRATE: bool = True
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    # Tuned SQLite pools, per engine: sized for the threadpool that runs sync endpoints (anyio default: 40 threads)
+    SQLITE_POOL_SIZE: int = 40
+    SQLITE_MAX_OVERFLOW: int = 10
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_CACHE_SIZE_KB: int = 65536
+
+    # Single persistent ChromaDB shared by RAG and indexing
+    CHROMA_PERSIST_DIR: str = "./chroma_db"
+    # Vector backend: "chroma" (persistent client) or "numpy" (in-process index, small catalogs)
+    VECTOR_BACKEND: str = "chroma"
+    VECTOR_INDEX_DIR: str = "./vector_index"
+    # Embedding cache shared by indexing and queries (None disables the on-disk store)
+    EMBEDDING_CACHE_SIZE: int = 10000
+    EMBEDDING_CACHE_DIR: Optional[str] = "./embedding_cache"
+    # ANN candidates (inside the metadata filter) that hybrid activity retrieval re-ranks with BM25
+    RAG_HYBRID_CANDIDATES: int = 50
+    # How often precomputed mood retrievals re-check collection versions for outside writes
+    RETRIEVAL_TABLE_CHECK_SECONDS: float = 30.0
     
     # Optional Spotify
     SPOTIFY_CLIENT_ID: Optional[str] = None
@@ -17,8 +48,67 @@ class Settings(BaseSettings):
     # HuggingFace (if using API instead of local)
     HF_API_KEY: Optional[str] = None
     
+    # Emotion model inference backend: "torch" (full precision) or "onnx" (int8 quantized ONNX Runtime).
+    # "onnx" is experimental: its accuracy delta against torch has not been measured yet.
+    EMOTION_BACKEND: str = "torch"
+    EMOTION_ONNX_DIR: str = "./models/emotion-onnx-int8"
+
+    # Emotion model micro-batching (requests arriving within the window share one forward pass)
+    EMOTION_BATCH_WINDOW_MS: float = 5.0
+    EMOTION_MAX_BATCH_SIZE: int = 16
+    # Chunk size for bulk scoring via /mood/detect/batch
+    EMOTION_BATCH_CHUNK_SIZE: int = 64
+    # Max texts per /mood/detect/batch request (larger bodies get a 422)
+    EMOTION_BATCH_MAX_TEXTS: int = 1000
+    # How long an NDJSON batch stream waits on a saturated executor before giving up
+    EMOTION_BATCH_RETRY_SECONDS: float = 10.0
+
+    # Dedicated emotion inference pool: requests beyond workers + queue get a 429.
+    # EMOTION_TORCH_THREADS pins torch's intra-op thread count (unset = torch default).
+    EMOTION_WORKERS: int = 16
+    EMOTION_QUEUE_SIZE: int = 64
+    EMOTION_TORCH_THREADS: Optional[int] = None
+
+    # Answer distress/boredom/exhaustion texts from rules alone, without a forward pass
+    EMOTION_RULE_FAST_PATH: bool = True
+
+    # Emotion analysis result cache (LRU + TTL, keyed on whitespace-normalized text).
+    # Set EMOTION_CACHE_DB_PATH to a SQLite file to keep entries across restarts.
+    EMOTION_CACHE_SIZE: int = 10000
+    EMOTION_CACHE_TTL_SECONDS: int = 3600
+    EMOTION_CACHE_DB_PATH: Optional[str] = None
+
     # OpenRouter
     OPENROUTER_API_KEY: Optional[str] = None
+    OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1/chat/completions"
+    # Shared HTTP client: pool sizing, keep-alive and retry backoff
+    OPENROUTER_HTTP2: bool = True
+    OPENROUTER_TIMEOUT_SECONDS: float = 60.0
+    OPENROUTER_MAX_CONNECTIONS: int = 20
+    OPENROUTER_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    OPENROUTER_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    OPENROUTER_MAX_RETRIES: int = 3
+    OPENROUTER_BACKOFF_BASE_SECONDS: float = 0.5
+    OPENROUTER_BACKOFF_MAX_SECONDS: float = 8.0
+    # Client-side governor: token bucket + max in-flight requests per model.
+    # OPENROUTER_MODEL_LIMITS overrides per model, e.g.
+    # {"mistralai/mistral-7b-instruct:free": {"rate_per_second": 1, "burst": 3, "max_in_flight": 2}}
+    OPENROUTER_RATE_PER_SECOND: float = 5.0
+    OPENROUTER_BURST: int = 10
+    OPENROUTER_MAX_IN_FLIGHT: int = 8
+    OPENROUTER_MODEL_LIMITS: Dict[str, Dict[str, float]] = {}
+    # Requests that would queue longer than this get the fallback response
+    OPENROUTER_QUEUE_DEADLINE_SECONDS: float = 5.0
+
+    # Planner fan-out: per-branch timeouts (seconds) before falling back
+    PLANNER_RAG_TIMEOUT_SECONDS: float = 2.0
+    PLANNER_LLM_TIMEOUT_SECONDS: float = 20.0
+    PLANNER_SPOTIFY_TIMEOUT_SECONDS: float = 3.0
+
+    # LLM response cache (per-call opt-in, exact prompt match)
+    LLM_CACHE_SIZE: int = 2000
+    LLM_CACHE_TTL_SECONDS: int = 1800
+    LLM_CACHE_DB_PATH: Optional[str] = None
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,43 @@
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import tuple_
+from typing import Generic, List, Optional, TypeVar
+from datetime import datetime
+import base64
+import binascii
+import json
+
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    payload = json.dumps({"t": created_at.isoformat(), "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(payload["t"]), int(payload["i"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_desc(stmt, model, cursor: Optional[str], limit: int):
+    """
+    Newest-first keyset pagination on (created_at, id). Fetches one extra
+    row so keyset_page() can tell whether another page exists.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    return stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+def keyset_page(rows, limit: int):
+    # Returns (items, next_cursor) for rows fetched by keyset_desc()
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    items = rows[:limit]
+    return items, encode_cursor(items[-1].created_at, items[-1].id)
@@ -0,0 +1,91 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+PRIORITY_INTERACTIVE = 0 # chat / voice
+PRIORITY_BACKGROUND = 1 # plans, affirmations
+
+class RateGovernor:
+    """
+    Token-bucket rate limiter combined with a max-in-flight cap for one
+    upstream. Waiters are served by priority (lower first), then FIFO.
+    acquire() returns False instead of waiting past its deadline.
+    """
+    def __init__(self, rate_per_second: float, burst: int, max_in_flight: int):
+        self.rate = rate_per_second
+        self.burst = max(1, burst)
+        self.max_in_flight = max(1, max_in_flight)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.in_flight = 0
+        self.rejected = 0
+        self._waiters = []
+        self._seq = itertools.count()
+        self._timer = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _try_take(self) -> bool:
+        self._refill()
+        if self.tokens >= 1 and self.in_flight < self.max_in_flight:
+            self.tokens -= 1
+            self.in_flight += 1
+            return True
+        return False
+
+    def _dispatch(self):
+        self._timer = None
+        while self._waiters:
+            _, _, future = self._waiters[0]
+            if future.done():
+                # Timed out or cancelled while queued
+                heapq.heappop(self._waiters)
+                continue
+            if not self._try_take():
+                break
+            heapq.heappop(self._waiters)
+            future.set_result(True)
+
+        # Blocked on tokens (not on in-flight slots): wake up when the next one is due
+        if self._waiters and self.in_flight < self.max_in_flight and self._timer is None and self.rate > 0:
+            delay = max(0.0, (1 - self.tokens) / self.rate)
+            self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    async def acquire(self, priority: int, deadline_seconds: float) -> bool:
+        if not self._waiters and self._try_take():
+            return True
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        self._dispatch()
+        try:
+            return await asyncio.wait_for(future, timeout=deadline_seconds)
+        except asyncio.TimeoutError:
+            self._return_granted(future)
+            self.rejected += 1
+            return False
+        except asyncio.CancelledError:
+            self._return_granted(future)
+            raise
+
+    def _return_granted(self, future):
+        # On Python 3.12+ wait_for drops a slot granted just before a timeout or cancel
+        if future.done() and not future.cancelled() and future.result():
+            self.release()
+
+    def release(self):
+        self.in_flight = max(0, self.in_flight - 1)
+        self._dispatch()
+
+    def stats(self) -> dict:
+        self._refill()
+        return {
+            "tokens": round(self.tokens, 2),
+            "in_flight": self.in_flight,
+            "queued": sum(1 for _, _, f in self._waiters if not f.done()),
+            "rejected": self.rejected
+        }
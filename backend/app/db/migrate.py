@@ -0,0 +1,33 @@
+import logging
+import os
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from app.core.config import settings
+from app.db.session import build_engine
+
+BASELINE_REVISION = "0001"
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic.ini")
+
+logger = logging.getLogger(__name__)
+
+def upgrade_database(url: str = None):
+    """
+    Runs Alembic migrations up to head. Databases created by the old
+    create_all() (tables present, no alembic_version) are stamped at the
+    baseline first so only the newer revisions run.
+    """
+    url = url or settings.SQLALCHEMY_DATABASE_URI
+    config = Config(ALEMBIC_INI)
+    config.attributes["url"] = url
+    config.attributes["configure_logger"] = False
+
+    engine = build_engine(url, profile="default")
+    try:
+        tables = set(inspect(engine).get_table_names())
+    finally:
+        engine.dispose()
+    if "users" in tables and "alembic_version" not in tables:
+        logger.info(f"Existing schema without migration history, stamping {BASELINE_REVISION}")
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
@@ -1,7 +1,192 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from typing import Optional
+import asyncio
+import logging
 
-# check_same_thread is needed for SQLite
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, connect_args={"check_same_thread": False})
+# Async driver for each sync URL scheme
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+# Engines splitting a server database's DB_POOL_SIZE / DB_MAX_OVERFLOW budget:
+# sync and async, each with a write and a read pool
+POOL_SHARES = 4
+
+def _sqlite_pragmas(read_only: bool):
+    # WAL lets readers run alongside the single writer; busy_timeout makes
+    # writers wait for the lock instead of failing with "database is locked"
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",
+        "PRAGMA temp_store=MEMORY"
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+def to_async_url(url: str) -> Optional[str]:
+    # None when no async driver is configured for the backend
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        return None
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+def _engine_options(url: str, profile: str, read_only: bool = False, is_async: bool = False):
+    parsed = make_url(url)
+    is_sqlite = parsed.get_backend_name() == "sqlite"
+    in_memory = is_sqlite and parsed.database in (None, "", ":memory:")
+
+    kwargs = {}
+    if is_sqlite:
+        # check_same_thread is needed for SQLite
+        kwargs["connect_args"] = {"check_same_thread": False}
+    else:
+        # Shared server database (several API replicas): validate and recycle pooled connections
+        kwargs.update(pool_pre_ping=settings.DB_POOL_PRE_PING, pool_recycle=settings.DB_POOL_RECYCLE_SECONDS)
+        if read_only and parsed.get_backend_name() == "postgresql":
+            kwargs["connect_args"] = (
+                {"server_settings": {"default_transaction_read_only": "on"}} if is_async
+                else {"options": "-c default_transaction_read_only=on"}
+            )
+    if not is_sqlite:
+        # Each engine gets an equal share of the per-replica connection budget (server max_connections)
+        kwargs.update(
+            pool_size=max(1, settings.DB_POOL_SIZE // POOL_SHARES),
+            max_overflow=settings.DB_MAX_OVERFLOW // POOL_SHARES,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS
+        )
+    elif profile == "tuned" and not in_memory:
+        # SQLite has no server connection limit: size every pool for the threadpool
+        kwargs.update(
+            pool_size=settings.SQLITE_POOL_SIZE,
+            max_overflow=settings.SQLITE_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS
+        )
+    return kwargs, is_sqlite and profile == "tuned" and not in_memory
+
+def _apply_pragmas(sync_engine, read_only: bool):
+    pragmas = _sqlite_pragmas(read_only)
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+def build_engine(url: str = None, profile: str = None, read_only: bool = False):
+    """
+    Creates an engine for the given database profile. "tuned" applies the
+    SQLite pragmas on every new connection and sizes the pool for the
+    threadpool; "default" is the plain engine. Server databases always get
+    their share of the connection budget. read_only engines refuse writes.
+    """
+    url = url or settings.SQLALCHEMY_DATABASE_URI
+    kwargs, tuned_sqlite = _engine_options(url, profile or settings.DB_PROFILE, read_only)
+    engine = create_engine(url, **kwargs)
+    if tuned_sqlite:
+        _apply_pragmas(engine, read_only)
+    return engine
+
+def build_async_engine(url: str = None, profile: str = None, read_only: bool = False):
+    # Same profile as build_engine, on the async driver (aiosqlite / asyncpg).
+    # Returns None for backends without an async driver.
+    url = url or settings.SQLALCHEMY_DATABASE_URI
+    async_url = to_async_url(url)
+    if async_url is None:
+        return None
+    kwargs, tuned_sqlite = _engine_options(url, profile or settings.DB_PROFILE, read_only, is_async=True)
+    engine = create_async_engine(async_url, **kwargs)
+    if tuned_sqlite:
+        _apply_pragmas(engine.sync_engine, read_only)
+    return engine
+
+class ThreadedSession:
+    """
+    AsyncSession stand-in over a sync Session, used when the database has
+    no async driver. Blocking calls run in a worker thread; results are
+    buffered there so iterating them never touches the connection.
+    """
+    def __init__(self, session):
+        self._session = session
+
+    def add(self, instance):
+        self._session.add(instance)
+
+    def _execute(self, statement, *args, **kwargs):
+        result = self._session.execute(statement, *args, **kwargs)
+        # Plain DML results have no rows to buffer; ORM results always do
+        if not getattr(result, "returns_rows", True):
+            return result
+        return result.freeze()()
+
+    async def execute(self, statement, *args, **kwargs):
+        return await asyncio.to_thread(self._execute, statement, *args, **kwargs)
+
+    async def commit(self):
+        await asyncio.to_thread(self._session.commit)
+
+    async def rollback(self):
+        await asyncio.to_thread(self._session.rollback)
+
+    async def refresh(self, instance):
+        await asyncio.to_thread(self._session.refresh, instance)
+
+    async def close(self):
+        await asyncio.to_thread(self._session.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+def _async_session_factory(async_engine, sync_engine):
+    if async_engine is not None:
+        return async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+    logging.getLogger(__name__).warning("No async driver for this database; async sessions run on the sync engine")
+    factory = sessionmaker(bind=sync_engine, expire_on_commit=False, autoflush=False)
+    return lambda: ThreadedSession(factory())
+
+engine = build_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Separate pool for history/list reads, so they never queue behind writers' connections
+read_engine = build_engine(read_only=True)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Async sessions for the hot endpoints, so DB waits don't hold threadpool workers
+# (the engines are None when falling back to the sync ones)
+async_engine = build_async_engine()
+AsyncSessionLocal = _async_session_factory(async_engine, engine)
+async_read_engine = build_async_engine(read_only=True)
+AsyncReadSessionLocal = _async_session_factory(async_read_engine, read_engine)
+
+# Shared FastAPI dependencies
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -0,0 +1,5 @@
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+
+# JSON documents: native JSONB on Postgres, JSON-encoded TEXT on SQLite
+JSONType = JSON().with_variant(JSONB(), "postgresql")
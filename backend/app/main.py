@@ -1,11 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.db.base import Base
-from app.db.session import engine
+from app.db.migrate import upgrade_database
+from app.db.session import async_engine, async_read_engine
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Bring the schema to the latest Alembic revision
+if settings.DB_AUTO_MIGRATE:
+    upgrade_database()
 
 app = FastAPI(title=settings.PROJECT_NAME)
 
@@ -23,10 +24,34 @@ def read_root():
 
 from app.api.v1.api import api_router
 from app.services.emotion_ai import emotion_analyzer
+from app.services.llm_service import llm_service
+from app.services.rag_service import rag_service
+import asyncio
+import logging
+
+@app.get("/llm/stats")
+def llm_stats():
+    # Cache hit/miss and single-flight coalescing counters for OpenRouter calls
+    return llm_service.stats()
 
 @app.on_event("startup")
 async def startup_event():
     # Preload the emotion model to avoid latency on first request
     emotion_analyzer.load_model()
+    # Open the pooled OpenRouter client once for the app's lifetime
+    await llm_service.startup()
+    # Precompute mood -> candidate retrievals so known moods skip vector search
+    try:
+        await asyncio.to_thread(rag_service.build_retrieval_table)
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Failed to build retrieval table: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    emotion_analyzer.executor.shutdown()
+    await llm_service.shutdown()
+    for async_db_engine in (async_engine, async_read_engine):
+        if async_db_engine is not None:
+            await async_db_engine.dispose()
 
 app.include_router(api_router, prefix="/api")
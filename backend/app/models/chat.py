@@ -1,16 +1,23 @@
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
+from app.db.types import JSONType
 
 class ChatHistory(Base):
     __tablename__ = "chat_history"
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     session_id = Column(String, index=True)
     role = Column(String) # user | assistant | system
     message = Column(Text)
-    metadata_json = Column("metadata", Text)
+    metadata_json = Column("metadata", JSONType)
     created_at = Column(TIMESTAMP, server_default=func.now())
     
     user = relationship("User")
+
+    # History: filter by user (+ session), ordered by time
+    __table_args__ = (
+        Index("ix_chat_history_user_id_session_id_created_at", "user_id", "session_id", "created_at"),
+        Index("ix_chat_history_user_id_created_at", "user_id", "created_at"),
+    )
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
+from app.db.types import JSONType
 from app.models.user import User
 
 class GameScore(Base):
@@ -10,7 +11,7 @@ class GameScore(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), index=True)
     game_name = Column(String, nullable=False, index=True)
     score = Column(Integer, nullable=False)
-    metadata_json = Column("metadata", Text) # JSON, using 'metadata_json' alias for python attr but 'metadata' for DB col
+    metadata_json = Column("metadata", JSONType) # 'metadata_json' for the python attr, 'metadata' for the DB col
     created_at = Column(TIMESTAMP, server_default=func.now())
     
     user = relationship("User")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
@@ -7,7 +7,7 @@ from app.models.user import User
 class Journal(Base):
     __tablename__ = "journal"
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title = Column(String)
     content = Column(Text)
     is_encrypted = Column(Integer, default=0) # 0 or 1
@@ -15,3 +15,6 @@ class Journal(Base):
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
     
     user = relationship("User")
+
+    # List: filter by user, newest first
+    __table_args__ = (Index("ix_journal_user_id_created_at", "user_id", "created_at"),)
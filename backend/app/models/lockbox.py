@@ -9,7 +9,7 @@ class Lockbox(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     label = Column(String)
-    encrypted_data = Column(LargeBinary, nullable=False) # BLOB
+    encrypted_data = Column(LargeBinary, nullable=False) # BLOB on SQLite, BYTEA on Postgres
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
     
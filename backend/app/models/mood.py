@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Text, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Text, TIMESTAMP, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
@@ -7,7 +7,7 @@ from app.models.user import User
 class MoodHistory(Base):
     __tablename__ = "mood_history"
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     mood = Column(String)
     emotion = Column(String)
     intensity = Column(Float)
@@ -17,3 +17,6 @@ class MoodHistory(Base):
     created_at = Column(TIMESTAMP, server_default=func.now(), index=True)
     
     user = relationship("User")
+
+    # History: filter by user, newest first
+    __table_args__ = (Index("ix_mood_history_user_id_created_at", "user_id", "created_at"),)
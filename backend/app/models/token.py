@@ -8,7 +8,7 @@ class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    token_hash = Column(String, nullable=False)
+    token_hash = Column(String, nullable=False, index=True) # looked up on every refresh/logout
     issued_at = Column(TIMESTAMP, server_default=func.now())
     expires_at = Column(TIMESTAMP)
     revoked = Column(Integer, default=0)
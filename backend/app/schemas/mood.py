@@ -1,14 +1,19 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List, Any
+from app.core.config import settings
 
 class MoodDetectRequest(BaseModel):
     text: str
 
+class MoodBatchRequest(BaseModel):
+    texts: List[str] = Field(..., max_length=settings.EMOTION_BATCH_MAX_TEXTS)
+
 class MoodResponse(BaseModel):
     mood: str
     emotion: str
     intensity: float
     energy_level: str
+    source: str = "model" # 'rules' | 'model'
 
 class MoodLogRequest(BaseModel):
     mood: str
@@ -12,14 +12,23 @@ Core Guidelines:
 
 Never mention you are an AI unless asked."""
         
-    def generate_response(self, user_message: str) -> str:
+    async def generate_response(self, user_message: str) -> str:
         # Use OpenRouter LLM
         # Using a reliable, fast model like Mistral 7B or similar via OpenRouter
-        response = llm_service.generate(
+        response = await llm_service.generate(
             system_prompt=self.system_prompt,
             user_prompt=user_message,
             model="mistralai/mistral-7b-instruct:free" # Free tier model or similar
         )
         return response
 
+    async def generate_response_stream(self, user_message: str):
+        # Same prompt as generate_response, yielded as text deltas
+        async for delta in llm_service.generate_stream(
+            system_prompt=self.system_prompt,
+            user_prompt=user_message,
+            model="mistralai/mistral-7b-instruct:free"
+        ):
+            yield delta
+
 chat_agent = ChatAgent()
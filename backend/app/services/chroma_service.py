@@ -1,47 +1,37 @@
-import chromadb
-from chromadb.utils import embedding_functions
+from app.services.vector_store import vector_store, ACTIVITIES_COLLECTION, MICRO_TASKS_COLLECTION
 import logging
 
 class ChromaService:
-    def __init__(self):
-        self.client = chromadb.PersistentClient(path="./chroma_db")
-        # Use default Sentence Transformer embedding
-        self.embedding_fn = embedding_functions.DefaultEmbeddingFunction()
-        
-        self.activities_collection = self.client.get_or_create_collection(
-            name="activities", embedding_function=self.embedding_fn
-        )
-        self.microtasks_collection = self.client.get_or_create_collection(
-            name="microtasks", embedding_function=self.embedding_fn
-        )
+    # Thin indexing/query wrapper over the shared vector store (same client and collections as RAGService)
+    @property
+    def activities_collection(self):
+        return vector_store.activities()
+
+    @property
+    def microtasks_collection(self):
+        return vector_store.micro_tasks()
 
     def add_activity(self, activity_id, text, metadata):
         # text could be description + mood
-        self.activities_collection.add(
+        vector_store.add(
+            ACTIVITIES_COLLECTION,
             documents=[text],
             metadatas=[metadata],
             ids=[str(activity_id)]
         )
 
     def query_activities(self, query_text, n_results=5, where=None):
-        return self.activities_collection.query(
-            query_texts=[query_text],
-            n_results=n_results,
-            where=where
-        )
+        return vector_store.query(ACTIVITIES_COLLECTION, query_text, n_results, where=where)
 
     def add_microtask(self, task_id, text, metadata):
-        self.microtasks_collection.add(
+        vector_store.add(
+            MICRO_TASKS_COLLECTION,
             documents=[text],
             metadatas=[metadata],
             ids=[str(task_id)]
         )
 
     def query_microtasks(self, query_text, n_results=5, where=None):
-        return self.microtasks_collection.query(
-            query_texts=[query_text],
-            n_results=n_results,
-            where=where
-        )
+        return vector_store.query(MICRO_TASKS_COLLECTION, query_text, n_results, where=where)
 
 chroma_service = ChromaService()
@@ -0,0 +1,164 @@
+from chromadb.api.types import EmbeddingFunction, Documents, Embeddings
+from collections import OrderedDict
+from typing import Optional
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import numpy as np
+
+class VectorFileStore:
+    """
+    Persistent content-hash -> float32 vector store. Vectors are appended
+    to one flat file read through a memory map; a SQLite index maps each
+    hash to its row. Rows are allocated inside an IMMEDIATE transaction so
+    the API and the indexing script can share the same directory.
+    """
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(directory, "index.sqlite"), check_same_thread=False, isolation_level=None)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS vectors (hash TEXT PRIMARY KEY, row INTEGER NOT NULL)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        self.dim = int(row[0]) if row else None
+        self._map = None
+        open(self.vectors_path, "ab").close()
+
+    def _rows(self, min_rows: int):
+        # Remap when another writer (or we) appended past the current mapping
+        if self._map is None or self._map.shape[0] < min_rows:
+            rows = os.path.getsize(self.vectors_path) // (4 * self.dim)
+            self._map = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        return self._map
+
+    def get_many(self, hashes):
+        if self.dim is None or not hashes:
+            return {}
+        with self._lock:
+            placeholders = ",".join("?" * len(hashes))
+            found = self._conn.execute(
+                f"SELECT hash, row FROM vectors WHERE hash IN ({placeholders})", list(hashes)
+            ).fetchall()
+            if not found:
+                return {}
+            matrix = self._rows(max(r for _, r in found) + 1)
+            return {h: np.array(matrix[r]) for h, r in found}
+
+    def put_many(self, items):
+        if not items:
+            return
+        with self._lock:
+            dim = len(items[0][1])
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self.dim is None:
+                    row = self._conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+                    self.dim = int(row[0]) if row else dim
+                    self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('dim', ?)", (str(self.dim),))
+                if dim != self.dim:
+                    raise ValueError(f"Embedding dimension {dim} does not match stored dimension {self.dim}")
+
+                placeholders = ",".join("?" * len(items))
+                known = {h for (h,) in self._conn.execute(
+                    f"SELECT hash FROM vectors WHERE hash IN ({placeholders})", [h for h, _ in items]
+                )}
+                new = [(h, v) for h, v in dict(items).items() if h not in known]
+                if new:
+                    start = self._conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM vectors").fetchone()[0]
+                    block = np.asarray([v for _, v in new], dtype=np.float32)
+                    with open(self.vectors_path, "r+b") as f:
+                        f.seek(start * 4 * self.dim)
+                        f.write(block.tobytes())
+                    self._conn.executemany(
+                        "INSERT INTO vectors (hash, row) VALUES (?, ?)",
+                        [(h, start + n) for n, (h, _) in enumerate(new)]
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+class CachingEmbeddingFunction(EmbeddingFunction[Documents]):
+    """
+    Wraps a Chroma embedding function with an in-memory LRU and an optional
+    VectorFileStore. A batch only sends its misses to the wrapped function.
+    """
+    def __init__(self, inner, max_size: int, directory: Optional[str] = None):
+        self.inner = inner
+        self.max_size = max_size
+        self.logger = logging.getLogger(__name__)
+        self._prefix = type(inner).__name__ + "\0"
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.store = VectorFileStore(directory) if directory else None
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256((self._prefix + text).encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vector):
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __call__(self, input: Documents) -> Embeddings:
+        keys = [self._key(text) for text in input]
+        vectors = {}
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    vectors[key] = vector
+            self.hits += sum(1 for key in keys if key in vectors)
+
+        missing = [key for key in dict.fromkeys(keys) if key not in vectors]
+        if missing and self.store:
+            try:
+                stored = self.store.get_many(missing)
+            except (sqlite3.Error, OSError) as e:
+                self.logger.error(f"Embedding store read failed: {e}")
+                stored = {}
+            with self._lock:
+                self.disk_hits += sum(1 for key in keys if key in stored)
+                for key, vector in stored.items():
+                    self._remember(key, vector)
+            vectors.update(stored)
+            missing = [key for key in missing if key not in stored]
+
+        if missing:
+            # Only the misses go to the model, in one batch
+            missing_set = set(missing)
+            texts = {key: text for key, text in zip(keys, input) if key in missing_set}
+            computed = self.inner([texts[key] for key in missing])
+            fresh = {key: np.asarray(vector, dtype=np.float32) for key, vector in zip(missing, computed)}
+            with self._lock:
+                self.misses += sum(1 for key in keys if key in fresh)
+                for key, vector in fresh.items():
+                    self._remember(key, vector)
+            vectors.update(fresh)
+            if self.store:
+                try:
+                    self.store.put_many(list(fresh.items()))
+                except (sqlite3.Error, OSError, ValueError) as e:
+                    self.logger.error(f"Embedding store write failed: {e}")
+
+        return [vectors[key].tolist() for key in keys]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            }
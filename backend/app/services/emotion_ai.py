@@ -1,36 +1,454 @@
 from transformers import pipeline
+from concurrent.futures import Future, ThreadPoolExecutor
+from app.core.config import settings
+from app.core.cache import TTLCache
+import asyncio
 import logging
+import os
+import queue
+import re
+import threading
+import time
 
-class EmotionAnalyzer:
+MODEL_NAME = "cardiffnlp/twitter-roberta-base-emotion"
+
+# Data-driven keyword table for the rule stage. Matching is plain substring
+# semantics on lowercased text ("suicid" also matches "suicidal").
+KEYWORD_RULES = {
+    "negative_context": [
+        "break", "broke", "fail", "bug", "crash", "stupid", "dumb", "worst",
+        "hate", "sucks", "annoy", "problem", "issue", "error", "slow", "lag", "glitch"
+    ],
+    "positive": [
+        "happy", "good", "great", "love", "fun", "best", "amazing", "lovely",
+        "win", "winner", "excited", "lol", "lmao", "funny", "nice", "cool",
+        "wonderful", "perfect", "better", "hope", "optimist", "glad", "enjoy"
+    ],
+    "distress": [
+        "done with life", "done with everything", "done with this life",
+        "can't take it", "cant take it", "can't take this", "cant take this",
+        "give up", "suicid", "end it all", "ending it all",
+        "want to die", "kill myself", "end my life"
+    ],
+    "boredom": ["bored", "nothing to do", "dull", "mid", "meh"],
+    "exhaustion": ["tired", "exhausted", "drained", "cooked", "social battery"],
+    "anxiety": ["anxious", "worried", "nervous", "stress", "spiraling"],
+    "frustration": ["frustrat", "annoy", "hate", "crash out"],
+    "optimism": ["hope", "hoping", "no cap", "clutch"]
+}
+
+class KeywordMatcher:
+    """
+    Matches every keyword of a rule table in one pass over the text.
+    The keywords are compiled into a single trie-shaped regex; at each text
+    position the longest keyword is captured, and each keyword also carries
+    the categories of every shorter keyword contained in it, so no
+    overlapping match is lost.
+    """
+    def __init__(self, rules: dict):
+        keyword_categories = {}
+        for category, keywords in rules.items():
+            for kw in keywords:
+                keyword_categories.setdefault(kw.lower(), set()).add(category)
+
+        self.categories = {}
+        for kw in keyword_categories:
+            cats = set()
+            for other, other_cats in keyword_categories.items():
+                if other in kw:
+                    cats |= other_cats
+            self.categories[kw] = frozenset(cats)
+
+        trie = {}
+        for kw in keyword_categories:
+            node = trie
+            for ch in kw:
+                node = node.setdefault(ch, {})
+            node[""] = True
+        self.pattern = re.compile("(?=(" + self._trie_pattern(trie) + "))") if trie else None
+
+    def _trie_pattern(self, node: dict) -> str:
+        branches = [re.escape(ch) + self._trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Keyword ends here but a longer one may continue; greedy prefers the longer
+            body = "(?:" + body + ")?"
+        return body
+
+    def match(self, text: str) -> set:
+        matched = set()
+        if self.pattern:
+            for m in self.pattern.finditer(text.lower()):
+                matched |= self.categories[m.group(1)]
+        return matched
+
+class PathLatency:
+    """Per-path request counters and latency (rules / cache / model)."""
     def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, path: str, seconds: float):
+        with self._lock:
+            stat = self._stats.setdefault(path, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            ms = seconds * 1000
+            stat["count"] += 1
+            stat["total_ms"] += ms
+            stat["max_ms"] = max(stat["max_ms"], ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                path: {
+                    "count": stat["count"],
+                    "avg_ms": stat["total_ms"] / stat["count"],
+                    "max_ms": stat["max_ms"]
+                }
+                for path, stat in self._stats.items()
+            }
+
+class InferenceQueueFull(Exception):
+    """Raised when the inference executor has no free worker or queue slot."""
+    pass
+
+class InferenceExecutor:
+    """
+    Dedicated thread pool for emotion inference, kept apart from Starlette's
+    shared threadpool so DB-bound routes aren't starved. Admission is bounded:
+    at most max_workers running plus queue_size waiting, anything beyond that
+    is rejected immediately with InferenceQueueFull.
+    """
+    def __init__(self, max_workers: int, queue_size: int):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="emotion-infer")
+        self._slots = threading.BoundedSemaphore(max_workers + queue_size)
+
+    def submit(self, fn, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise InferenceQueueFull("Emotion inference queue is full")
+        try:
+            future = self.pool.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    async def run(self, fn, *args):
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+class MicroBatcher:
+    """
+    Collects classifier requests that arrive within a short window and runs
+    them through the model as one padded batch. Each caller blocks on its own
+    Future and receives only its own scores.
+    """
+    def __init__(self, classify_batch, window_ms: float, max_batch_size: int):
+        self.classify_batch = classify_batch
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self.logger = logging.getLogger(__name__)
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="emotion-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, text: str) -> Future:
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def _collect(self):
+        # Block for the first request, then gather whatever arrives inside the window
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [text for text, _ in batch]
+            try:
+                outputs = self.classify_batch(texts)
+                for (_, future), output in zip(batch, outputs):
+                    future.set_result(output)
+            except Exception as e:
+                self.logger.error(f"Emotion batch of {len(batch)} failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+class EmotionAnalyzer:
+    def __init__(self, backend: str = None):
+        self.backend = backend or settings.EMOTION_BACKEND
         self.classifier = None
+        # The HF pipeline and its fast tokenizer are not safe to call concurrently
+        self._classifier_lock = threading.Lock()
+        self.batcher = None
+        self.matcher = KeywordMatcher(KEYWORD_RULES)
+        self.latency = PathLatency()
+        self.executor = InferenceExecutor(settings.EMOTION_WORKERS, settings.EMOTION_QUEUE_SIZE)
         self.logger = logging.getLogger(__name__)
+        # Repeated short texts ("bored", "meh") skip the forward pass entirely
+        self.score_cache = TTLCache(
+            settings.EMOTION_CACHE_SIZE, settings.EMOTION_CACHE_TTL_SECONDS,
+            namespace=f"emotion_scores:{self.backend}", disk_path=settings.EMOTION_CACHE_DB_PATH
+        )
+        self.result_cache = TTLCache(
+            settings.EMOTION_CACHE_SIZE, settings.EMOTION_CACHE_TTL_SECONDS,
+            namespace=f"emotion_results:{self.backend}", disk_path=settings.EMOTION_CACHE_DB_PATH
+        )
 
     def load_model(self):
         if not self.classifier:
-            self.logger.info("Loading Emotion Model...")
-            # This will download the model (~500MB) on first run
-            self.classifier = pipeline(
-                "text-classification", 
-                model="cardiffnlp/twitter-roberta-base-emotion", 
-                top_k=None
-            )
+            self._pin_torch_threads()
+            self.logger.info(f"Loading Emotion Model ({self.backend} backend)...")
+            if self.backend == "onnx":
+                self.logger.warning("EMOTION_BACKEND=onnx is experimental; its accuracy delta vs torch is unmeasured.")
+                self.classifier = self._load_onnx_pipeline()
+            if not self.classifier:
+                # This will download the model (~500MB) on first run
+                self.classifier = pipeline(
+                    "text-classification", 
+                    model=MODEL_NAME, 
+                    top_k=None
+                )
             self.logger.info("Emotion Model loaded.")
+        if not self.batcher and settings.EMOTION_MAX_BATCH_SIZE > 1:
+            self.batcher = MicroBatcher(
+                self._classify_batch,
+                window_ms=settings.EMOTION_BATCH_WINDOW_MS,
+                max_batch_size=settings.EMOTION_MAX_BATCH_SIZE
+            )
+
+    def _pin_torch_threads(self):
+        # Keep intra-op parallelism fixed so inference can't oversubscribe the CPU
+        if not settings.EMOTION_TORCH_THREADS:
+            return
+        try:
+            import torch
+            torch.set_num_threads(settings.EMOTION_TORCH_THREADS)
+        except ImportError:
+            pass
+
+    def _load_onnx_pipeline(self):
+        """
+        Builds the same text-classification pipeline on top of an int8 dynamically
+        quantized ONNX Runtime export. The export is done once and cached in
+        EMOTION_ONNX_DIR. Returns None if optimum/onnxruntime are not installed.
+        """
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            from transformers import AutoTokenizer
+        except ImportError:
+            self.logger.warning("optimum[onnxruntime] is not installed. Falling back to the PyTorch backend.")
+            return None
+
+        model_dir = settings.EMOTION_ONNX_DIR
+        quantized_file = "model_quantized.onnx"
+        if not os.path.exists(os.path.join(model_dir, quantized_file)):
+            self.logger.info("Exporting Emotion Model to ONNX with int8 dynamic quantization...")
+            export_dir = os.path.join(model_dir, "fp32")
+            ORTModelForSequenceClassification.from_pretrained(MODEL_NAME, export=True).save_pretrained(export_dir)
+            quantizer = ORTQuantizer.from_pretrained(export_dir)
+            qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=model_dir, quantization_config=qconfig)
+            AutoTokenizer.from_pretrained(MODEL_NAME).save_pretrained(model_dir)
+
+        model = ORTModelForSequenceClassification.from_pretrained(model_dir, file_name=quantized_file)
+        tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        # Same label set as the PyTorch model: the id2label config is carried over by the export
+        return pipeline("text-classification", model=model, tokenizer=tokenizer, top_k=None)
+
+    def _classify_batch(self, texts: list):
+        # One padded forward pass for the whole batch; returns one score list per text.
+        # Serialized so the batcher thread and bulk scoring never share the tokenizer.
+        with self._classifier_lock:
+            return self.classifier(texts, batch_size=len(texts), padding=True, truncation=True)
+
+    def classify(self, text: str):
+        self.load_model()
+        if self.batcher:
+            return self.batcher.submit(text).result()
+        return self._classify_batch([text])[0]
+
+    def _is_garbage(self, text: str) -> bool:
+        # Likely random string like "asdfghjkl"
+        return len(text) > 8 and " " not in text
+
+    def _garbage_result(self):
+        return {
+            "mood": "low_energy",
+            "emotion": "neutral",
+            "intensity": 0.0,
+            "all_scores": [],
+            "source": "rules"
+        }
+
+    def _rule_fast_path(self, text: str):
+        """
+        Answers texts whose outcome the rule overrides decide regardless of
+        the model, without running the classifier. The sarcasm rule fires
+        before the overrides, so texts with negative context still go to the model.
+        """
+        if not settings.EMOTION_RULE_FAST_PATH:
+            return None
+        matched = self.matcher.match(text)
+        if "negative_context" in matched:
+            return None
+        if "distress" in matched:
+            emotion, mood, score = "sadness", "sad", 0.99
+        elif "boredom" in matched:
+            emotion, mood, score = "boredom", "low_energy", 0.85
+        elif "exhaustion" in matched:
+            emotion, mood, score = "exhaustion", "low_energy", 0.9
+        else:
+            return None
+        return {
+            "mood": mood,
+            "emotion": emotion,
+            "intensity": score,
+            "all_scores": [],
+            "source": "rules"
+        }
+
+    def _cache_key(self, text: str) -> str:
+        # Whitespace only; the classifier is case-sensitive, so case stays in the key
+        return " ".join(text.split())
+
+    def cache_stats(self):
+        return {
+            "scores": self.score_cache.stats(),
+            "results": self.result_cache.stats()
+        }
+
+    def latency_stats(self):
+        return self.latency.snapshot()
 
     def analyze(self, text: str):
+        start = time.perf_counter()
+        result, path = self._analyze(text)
+        self.latency.record(path, time.perf_counter() - start)
+        return result
+
+    async def analyze_async(self, text: str):
+        """
+        Async variant of analyze() for event-loop callers. Rule hits are
+        answered inline; the cache lookup (which may read the disk tier) and
+        model work run once on the dedicated inference executor. Raises
+        InferenceQueueFull when the executor is saturated.
+        """
+        start = time.perf_counter()
+        result = self._analyze_rules(text)
+        path = "rules"
+        if result is None:
+            result, path = await self.executor.run(self._analyze_after_rules, text)
+        self.latency.record(path, time.perf_counter() - start)
+        return result
+
+    async def analyze_batch_async(self, texts: list):
+        return await self.executor.run(self.analyze_batch, texts)
+
+    def _analyze(self, text: str):
+        result = self._analyze_rules(text)
+        if result is not None:
+            return result, "rules"
+        return self._analyze_after_rules(text)
+
+    def _analyze_after_rules(self, text: str):
+        result, path = self._analyze_cached(text)
+        if result is not None:
+            return result, path
+
+        # 1. Model Classification (micro-batched with concurrent requests)
+        results = self.classify(text)
+        return self._store_model_result(text, results), "model"
+
+    def _analyze_rules(self, text: str):
+        """
+        Resolves a text from rules alone (no I/O). Returns None when the
+        caches or the classifier have to be consulted.
+        """
         # 0. Garbage / Key-smash Check
-        if len(text) > 8 and " " not in text:
-             # Likely random string like "asdfghjkl"
-             return {
-                 "mood": "low_energy",
-                 "emotion": "neutral",
-                 "intensity": 0.0,
-                 "all_scores": []
-             }
-
-        # 1. Model Classification
-        self.load_model()
-        results = self.classifier(text)[0]
+        if self._is_garbage(text):
+             return self._garbage_result()
+
+        # Distress / boredom / exhaustion are decided by rules alone
+        return self._rule_fast_path(text)
+
+    def _analyze_cached(self, text: str):
+        # Returns (None, None) on a cache miss
+        key = self._cache_key(text)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            return dict(cached), "cache"
+
+        results = self.score_cache.get(key)
+        if results is not None:
+            return self._store_model_result(text, results, cache_scores=False), "cache"
+        return None, None
+
+    def _store_model_result(self, text: str, results: list, cache_scores: bool = True):
+        key = self._cache_key(text)
+        if cache_scores:
+            self.score_cache.set(key, results)
+        result = self._postprocess(text, results)
+        self.result_cache.set(key, result)
+        return dict(result)
+
+    def analyze_batch(self, texts: list):
+        """
+        Analyzes many texts with one batched classifier call per chunk.
+        Texts with the same cache key are classified once. Returns one
+        result dict per input text, in order.
+        """
+        outputs = [None] * len(texts)
+        # cache key -> indices of the texts waiting on the classifier
+        pending = {}
+        for i, text in enumerate(texts):
+            start = time.perf_counter()
+            result = self._analyze_rules(text)
+            path = "rules"
+            if result is None:
+                result, path = self._analyze_cached(text)
+            if result is None:
+                pending.setdefault(self._cache_key(text), []).append(i)
+                continue
+            outputs[i] = result
+            self.latency.record(path, time.perf_counter() - start)
+
+        if pending:
+            self.load_model()
+        unique = list(pending.values())
+        chunk_size = max(1, settings.EMOTION_BATCH_CHUNK_SIZE)
+        for start in range(0, len(unique), chunk_size):
+            chunk = unique[start:start + chunk_size]
+            chunk_start = time.perf_counter()
+            scores = self._classify_batch([texts[indices[0]] for indices in chunk])
+            for indices, results in zip(chunk, scores):
+                result = self._store_model_result(texts[indices[0]], results)
+                for i in indices:
+                    outputs[i] = dict(result)
+            # Amortize the batched forward pass over the items it answered
+            items = sum(len(indices) for indices in chunk)
+            per_item = (time.perf_counter() - chunk_start) / items
+            for _ in range(items):
+                self.latency.record("model", per_item)
+        return outputs
+
+    def _postprocess(self, text: str, results: list):
         top_result = max(results, key=lambda x: x['score'])
         
         emotion = top_result['label']
@@ -45,13 +463,12 @@ class EmotionAnalyzer:
         if len(text) < 15: 
              confidence_threshold = 0.80
 
+        # One pass over the text finds every keyword category for the rules below
+        matched = self.matcher.match(text)
+
         # Sarcasm Detector: If model sees 'Happy' but text has negative words -> It's Sarcasm/Anger
         if emotion in ["joy", "optimism"]:
-             negative_context = [
-                 "break", "broke", "fail", "bug", "crash", "stupid", "dumb", "worst", 
-                 "hate", "sucks", "annoy", "problem", "issue", "error", "slow", "lag", "glitch"
-             ]
-             if any(neg in text.lower() for neg in negative_context):
+             if "negative_context" in matched:
                   emotion = "anger"
                   mood = "stressed"
                   # Trust this sarcasm detection
@@ -59,17 +476,13 @@ class EmotionAnalyzer:
                       "mood": mood,
                       "emotion": emotion,
                       "intensity": 0.9,
-                      "all_scores": []
+                      "all_scores": [],
+                      "source": "model"
                   }
 
         # Anti-Bias: The model over-predicts 'joy'/'optimism' for neutral text WITHOUT positive words.
         if emotion in ["joy", "optimism"]:
-             positive_keywords = [
-                 "happy", "good", "great", "love", "fun", "best", "amazing", "lovely", 
-                 "win", "winner", "excited", "lol", "lmao", "funny", "nice", "cool", 
-                 "wonderful", "perfect", "better", "hope", "optimist", "glad", "enjoy"
-             ]
-             if not any(pw in text.lower() for pw in positive_keywords):
+             if "positive" not in matched:
                  # No obvious positive words? Require EXTREME confidence (0.90) to avoid false positives
                  confidence_threshold = max(confidence_threshold, 0.90)
              else:
@@ -91,40 +504,33 @@ class EmotionAnalyzer:
             mood = mood_map.get(emotion, "neutral")
 
         # 3. Rule-based Overrides & Safety Checks
-        text_lower = text.lower()
         
         # Critical Safety
-        distress_signals = [
-            "done with life", "done with everything", "done with this life", 
-            "can't take it", "cant take it", "can't take this", "cant take this",
-            "give up", "suicid", "end it all", "ending it all", 
-            "want to die", "kill myself", "end my life"
-        ]
-        if any(ds in text_lower for ds in distress_signals):
+        if "distress" in matched:
              emotion = "sadness"
              mood = "sad"
              score = 0.99
         # Boredom / Low Energy
-        elif "bored" in text_lower or "nothing to do" in text_lower or "dull" in text_lower or "mid" in text_lower or "meh" in text_lower:
+        elif "boredom" in matched:
             emotion = "boredom"
             mood = "low_energy"
             score = max(score, 0.85) 
         # Exhaustion
-        elif "tired" in text_lower or "exhausted" in text_lower or "drained" in text_lower or "cooked" in text_lower or "social battery" in text_lower:
+        elif "exhaustion" in matched:
             emotion = "exhaustion"
             mood = "low_energy"
             score = max(score, 0.9)
         # Anxiety
-        elif "anxious" in text_lower or "worried" in text_lower or "nervous" in text_lower or "stress" in text_lower or "spiraling" in text_lower:
+        elif "anxiety" in matched:
             emotion = "fear"
             mood = "anxious"
         # Frustration/Anger
-        elif "frustrat" in text_lower or "annoy" in text_lower or "hate" in text_lower or "crash out" in text_lower:
+        elif "frustration" in matched:
              emotion = "anger"
              mood = "stressed"
              score = max(score, 0.85)
         # Optimism correction
-        elif "hope" in text_lower or "hoping" in text_lower or "no cap" in text_lower or "clutch" in text_lower:
+        elif "optimism" in matched:
              emotion = "optimism"
              mood = "happy"
              score = max(score, 0.85)
@@ -133,7 +539,8 @@ class EmotionAnalyzer:
             "mood": mood,
             "emotion": emotion,
             "intensity": score,
-            "all_scores": results
+            "all_scores": results,
+            "source": "model"
         }
 
 emotion_analyzer = EmotionAnalyzer()
@@ -1,22 +1,74 @@
 import httpx
 import json
 from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.rate_limit import RateGovernor, PRIORITY_INTERACTIVE
+import hashlib
 import logging
 import asyncio
+import random
 
 class OpenRouterService:
-    def __init__(self):
-        self.api_key = settings.OPENROUTER_API_KEY
-        self.base_url = "https://openrouter.ai/api/v1/chat/completions"
+    def __init__(self, api_key: str = None, base_url: str = None):
+        self.api_key = api_key or settings.OPENROUTER_API_KEY
+        self.base_url = base_url or settings.OPENROUTER_BASE_URL
         self.logger = logging.getLogger(__name__)
         # Default model: Mistral 7B (Free, Fast, Good Instruction Following)
         self.model = "mistralai/mistral-7b-instruct:free" 
-        
-    async def generate(self, system_prompt: str, user_prompt: str, model: str = None) -> str:
-        if not self.api_key:
-            self.logger.warning("OPENROUTER_API_KEY not set. Returning mock response.")
-            return self._get_fallback_response(system_prompt)
+        # Long-lived pooled client, opened on app startup and closed on shutdown
+        self.client = None
+        # Response cache; call sites opt in per call with cache=True
+        self.response_cache = TTLCache(
+            settings.LLM_CACHE_SIZE, settings.LLM_CACHE_TTL_SECONDS,
+            namespace="llm_responses", disk_path=settings.LLM_CACHE_DB_PATH
+        )
+        # Single-flight: identical cacheable prompts in flight share one upstream request
+        self._inflight = {}
+        self.coalesced_calls = 0
+        # Per-model rate limit + concurrency cap, created on first use
+        self.governors = {}
+
+    def _build_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.OPENROUTER_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENROUTER_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OPENROUTER_KEEPALIVE_EXPIRY_SECONDS
+        )
+        timeout = httpx.Timeout(settings.OPENROUTER_TIMEOUT_SECONDS)
+        try:
+            return httpx.AsyncClient(http2=settings.OPENROUTER_HTTP2, limits=limits, timeout=timeout)
+        except ImportError:
+            # http2=True needs the 'h2' package (httpx[http2])
+            self.logger.warning("h2 is not installed. OpenRouter client falling back to HTTP/1.1.")
+            return httpx.AsyncClient(limits=limits, timeout=timeout)
+
+    async def startup(self):
+        if self.client is None:
+            self.client = self._build_client()
+
+    async def shutdown(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        # Scripts and tests may call generate() without the app lifecycle
+        if self.client is None:
+            await self.startup()
+        return self.client
+
+    def _backoff_delay(self, attempt: int) -> float:
+        # Exponential backoff with full jitter
+        cap = min(settings.OPENROUTER_BACKOFF_MAX_SECONDS, settings.OPENROUTER_BACKOFF_BASE_SECONDS * (2 ** attempt))
+        return random.uniform(0, cap)
 
+    def _is_retryable(self, e: Exception) -> bool:
+        # Rate limits and upstream 5xx are transient; other HTTP errors are not
+        if isinstance(e, httpx.HTTPStatusError):
+            return e.response.status_code == 429 or e.response.status_code >= 500
+        return isinstance(e, httpx.RequestError)
+
+    def _build_request(self, system_prompt: str, user_prompt: str, model: str = None):
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "HTTP-Referer": "http://localhost:8000",
@@ -31,24 +83,171 @@ class OpenRouterService:
                 {"role": "user", "content": user_prompt}
             ]
         }
-        
-        max_retries = 3
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            for attempt in range(max_retries):
-                try:
-                    response = await client.post(self.base_url, headers=headers, json=data)
+        return headers, data
+
+    def _cache_scope(self, model: str, system_prompt: str) -> str:
+        system_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+        return f"{model}:{system_hash}"
+
+    def _normalize_prompt(self, user_prompt: str) -> str:
+        return " ".join(user_prompt.lower().split())
+
+    def cache_stats(self):
+        return self.response_cache.stats()
+
+    def stats(self):
+        return {
+            "cache": self.cache_stats(),
+            "inflight": len(self._inflight),
+            "coalesced_calls": self.coalesced_calls,
+            "governors": {model: governor.stats() for model, governor in self.governors.items()}
+        }
+
+    def _get_governor(self, model: str) -> RateGovernor:
+        governor = self.governors.get(model)
+        if governor is None:
+            limits = settings.OPENROUTER_MODEL_LIMITS.get(model, {})
+            governor = RateGovernor(
+                rate_per_second=limits.get("rate_per_second", settings.OPENROUTER_RATE_PER_SECOND),
+                burst=limits.get("burst", settings.OPENROUTER_BURST),
+                max_in_flight=limits.get("max_in_flight", settings.OPENROUTER_MAX_IN_FLIGHT)
+            )
+            self.governors[model] = governor
+        return governor
+
+    async def _acquire(self, model: str, priority: int) -> bool:
+        # Fast-fail (caller falls back) rather than queue past the deadline
+        acquired = await self._get_governor(model).acquire(priority, settings.OPENROUTER_QUEUE_DEADLINE_SECONDS)
+        if not acquired:
+            self.logger.warning(f"OpenRouter governor for {model} saturated; using fallback response.")
+        return acquired
+
+    async def generate(self, system_prompt: str, user_prompt: str, model: str = None, cache: bool = False, priority: int = PRIORITY_INTERACTIVE) -> str:
+        """
+        cache=True reuses a previous answer for the same (model, system prompt,
+        normalized user prompt) and lets concurrent identical calls share one
+        upstream request. Leave it off for free-form or safety-sensitive turns. priority=PRIORITY_BACKGROUND
+        lets interactive (chat/voice) calls go first when the upstream is busy.
+        """
+        if not self.api_key:
+            self.logger.warning("OPENROUTER_API_KEY not set. Returning mock response.")
+            return self._get_fallback_response(system_prompt)
+
+        model = model or self.model
+        if not cache:
+            content = await self._complete(system_prompt, user_prompt, model, priority)
+            return content if content is not None else self._get_fallback_response(system_prompt)
+
+        scope = self._cache_scope(model, system_prompt)
+        normalized = self._normalize_prompt(user_prompt)
+        key = hashlib.sha256(f"{scope}:{normalized}".encode("utf-8")).hexdigest()
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced_calls += 1
+            self.logger.debug(f"Coalesced LLM call onto in-flight request ({self.coalesced_calls} total)")
+        else:
+            inflight = asyncio.ensure_future(
+                self._generate_cached(system_prompt, user_prompt, model, key, priority)
+            )
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller going away doesn't cancel the request for the others
+        return await asyncio.shield(inflight)
+
+    async def _generate_cached(self, system_prompt: str, user_prompt: str, model: str, key: str, priority: int) -> str:
+        content = await self._complete(system_prompt, user_prompt, model, priority)
+        if content is None:
+            # Never cache fallbacks
+            return self._get_fallback_response(system_prompt)
+
+        self.response_cache.set(key, content)
+        return content
+
+    async def _complete(self, system_prompt: str, user_prompt: str, model: str, priority: int = PRIORITY_INTERACTIVE):
+        # One upstream completion with retries; None if every attempt failed
+        headers, data = self._build_request(system_prompt, user_prompt, model)
+        max_retries = settings.OPENROUTER_MAX_RETRIES
+        client = await self._get_client()
+        governor = self._get_governor(model)
+        for attempt in range(max_retries):
+            if not await self._acquire(model, priority):
+                return None
+            try:
+                response = await client.post(self.base_url, headers=headers, json=data)
+                response.raise_for_status()
+                result = response.json()
+                return result['choices'][0]['message']['content'].strip()
+            except (httpx.RequestError, httpx.HTTPStatusError) as e:
+                self.logger.error(f"OpenRouter attempt {attempt+1} failed: {e}")
+                if not self._is_retryable(e) or attempt == max_retries - 1:
+                    return None
+            except Exception as e:
+                self.logger.error(f"Unexpected LLM error: {e}")
+                return None
+            finally:
+                governor.release()
+            # Back off without holding an in-flight slot
+            await asyncio.sleep(self._backoff_delay(attempt))
+        return None
+
+    async def generate_stream(self, system_prompt: str, user_prompt: str, model: str = None):
+        """
+        Streams the completion as text deltas (OpenRouter SSE). Retries only
+        before the first token; if nothing was streamed, yields the fallback
+        response instead.
+        """
+        if not self.api_key:
+            self.logger.warning("OPENROUTER_API_KEY not set. Returning mock response.")
+            yield self._get_fallback_response(system_prompt)
+            return
+
+        model = model or self.model
+        headers, data = self._build_request(system_prompt, user_prompt, model)
+        data["stream"] = True
+        max_retries = settings.OPENROUTER_MAX_RETRIES
+        client = await self._get_client()
+        governor = self._get_governor(model)
+        for attempt in range(max_retries):
+            started = False
+            if not await self._acquire(model, PRIORITY_INTERACTIVE):
+                yield self._get_fallback_response(system_prompt)
+                return
+            try:
+                async with client.stream("POST", self.base_url, headers=headers, json=data) as response:
                     response.raise_for_status()
-                    result = response.json()
-                    return result['choices'][0]['message']['content'].strip()
-                except httpx.RequestError as e:
-                    self.logger.error(f"OpenRouter attempt {attempt+1} failed: {e}")
-                    if attempt < max_retries - 1:
-                        await asyncio.sleep(2) # Wait 2 seconds before retrying
-                    else:
-                        return self._get_fallback_response(system_prompt)
-                except Exception as e:
-                    self.logger.error(f"Unexpected LLM error: {e}")
-                    return self._get_fallback_response(system_prompt)
+                    async for line in response.aiter_lines():
+                        # Skip keep-alive comments (": OPENROUTER PROCESSING") and blank lines
+                        if not line.startswith("data:"):
+                            continue
+                        payload = line[5:].strip()
+                        if payload == "[DONE]":
+                            return
+                        chunk = json.loads(payload)
+                        delta = chunk['choices'][0].get('delta', {}).get('content')
+                        if delta:
+                            started = True
+                            yield delta
+                return
+            except (httpx.RequestError, httpx.HTTPStatusError) as e:
+                self.logger.error(f"OpenRouter stream attempt {attempt+1} failed: {e}")
+                if started:
+                    # Can't replay tokens the caller already has
+                    return
+                if not self._is_retryable(e) or attempt == max_retries - 1:
+                    yield self._get_fallback_response(system_prompt)
+                    return
+            except Exception as e:
+                self.logger.error(f"Unexpected LLM stream error: {e}")
+                if not started:
+                    yield self._get_fallback_response(system_prompt)
+                return
+            finally:
+                governor.release()
+            await asyncio.sleep(self._backoff_delay(attempt))
     
     def _get_fallback_response(self, system_prompt):
         s_lower = system_prompt.lower()
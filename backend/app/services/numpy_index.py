@@ -0,0 +1,180 @@
+import json
+import logging
+import os
+import threading
+import numpy as np
+
+def _matches(where: dict, metadata: dict) -> bool:
+    # Subset of Chroma's where-filter language
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(_matches(c, metadata) for c in condition):
+                return False
+            continue
+        if key == "$or":
+            if not any(_matches(c, metadata) for c in condition):
+                return False
+            continue
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        value = metadata.get(key)
+        for op, target in condition.items():
+            if op == "$ne":
+                ok = value != target
+            elif op == "$nin":
+                ok = value not in target
+            elif value is None:
+                ok = False
+            elif op == "$eq":
+                ok = value == target
+            elif op == "$in":
+                ok = value in target
+            elif op == "$gt":
+                ok = value > target
+            elif op == "$gte":
+                ok = value >= target
+            elif op == "$lt":
+                ok = value < target
+            elif op == "$lte":
+                ok = value <= target
+            else:
+                raise ValueError(f"Unsupported where operator: {op}")
+            if not ok:
+                return False
+    return True
+
+class NumpyCollection:
+    """
+    In-process stand-in for a Chroma collection over small catalogs.
+    Vectors are L2-normalized float32 rows in a memory-mapped file, so
+    top-k is one dot product; documents and metadata sit next to it as
+    JSON. Implements the collection calls the services use: count, add,
+    upsert, get and query. A load replaces one (ids, documents, metadatas,
+    matrix) snapshot tuple in a single assignment and readers work on the
+    snapshot they picked up, so a concurrent reload never mixes arrays.
+    """
+    def __init__(self, name: str, directory: str, embedding_function):
+        os.makedirs(directory, exist_ok=True)
+        self.name = name
+        self.embedding_function = embedding_function
+        self.logger = logging.getLogger(__name__)
+        self.vectors_path = os.path.join(directory, f"{name}.f32")
+        self.meta_path = os.path.join(directory, f"{name}.json")
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._snapshot = ([], [], [], np.zeros((0, 0), dtype=np.float32))
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.meta_path):
+            return
+        with open(self.meta_path) as f:
+            meta = json.load(f)
+        ids = meta["ids"]
+        if ids:
+            matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(len(ids), meta["dim"]))
+        else:
+            matrix = np.zeros((0, 0), dtype=np.float32)
+        self._snapshot = (ids, meta["documents"], meta["metadatas"], matrix)
+        self._mtime = os.path.getmtime(self.meta_path)
+
+    def _reload_if_changed(self):
+        # Picks up writes from another process (e.g. scripts/init_chroma.py)
+        try:
+            mtime = os.path.getmtime(self.meta_path)
+        except OSError:
+            return
+        if mtime != self._mtime:
+            with self._lock:
+                self._load()
+
+    def _save(self, ids, documents, metadatas, matrix):
+        # Write to temp files and swap, so readers never see a half-written index
+        np.asarray(matrix, dtype=np.float32).tofile(self.vectors_path + ".tmp")
+        with open(self.meta_path + ".tmp", "w") as f:
+            json.dump({"dim": int(matrix.shape[1]) if len(ids) else 0, "ids": ids,
+                       "documents": documents, "metadatas": metadatas}, f)
+        os.replace(self.vectors_path + ".tmp", self.vectors_path)
+        os.replace(self.meta_path + ".tmp", self.meta_path)
+        self._load()
+
+    def _embed(self, texts):
+        vectors = np.asarray(self.embedding_function(list(texts)), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def count(self) -> int:
+        self._reload_if_changed()
+        return len(self._snapshot[0])
+
+    def upsert(self, ids, documents, metadatas=None, embeddings=None):
+        metadatas = metadatas or [{} for _ in ids]
+        vectors = self._embed(documents) if embeddings is None else np.asarray(embeddings, dtype=np.float32)
+        with self._lock:
+            ids_now, docs_now, metas_now, matrix_now = self._snapshot
+            all_ids, all_docs, all_metas = list(ids_now), list(docs_now), list(metas_now)
+            matrix = np.array(matrix_now) if all_ids else np.zeros((0, vectors.shape[1]), dtype=np.float32)
+            position = {doc_id: n for n, doc_id in enumerate(all_ids)}
+            new_rows = []
+            for doc_id, doc, meta, vector in zip(ids, documents, metadatas, vectors):
+                if doc_id in position:
+                    n = position[doc_id]
+                    all_docs[n], all_metas[n], matrix[n] = doc, meta or {}, vector
+                else:
+                    position[doc_id] = len(all_ids)
+                    all_ids.append(doc_id)
+                    all_docs.append(doc)
+                    all_metas.append(meta or {})
+                    new_rows.append(vector)
+            if new_rows:
+                matrix = np.vstack([matrix, np.asarray(new_rows, dtype=np.float32)])
+            self._save(all_ids, all_docs, all_metas, matrix)
+
+    def add(self, ids, documents, metadatas=None, embeddings=None):
+        self.upsert(ids, documents, metadatas, embeddings)
+
+    def _select(self, snapshot, ids=None, where=None):
+        all_ids, _, all_metas, _ = snapshot
+        rows = range(len(all_ids))
+        if ids is not None:
+            wanted = set(ids)
+            rows = [n for n in rows if all_ids[n] in wanted]
+        if where:
+            rows = [n for n in rows if _matches(where, all_metas[n])]
+        return list(rows)
+
+    def get(self, ids=None, where=None, limit=None, offset=None, include=None):
+        self._reload_if_changed()
+        snapshot = self._snapshot
+        all_ids, all_docs, all_metas, _ = snapshot
+        rows = self._select(snapshot, ids, where)[offset or 0:]
+        if limit is not None:
+            rows = rows[:limit]
+        return {
+            "ids": [all_ids[n] for n in rows],
+            "documents": [all_docs[n] for n in rows],
+            "metadatas": [all_metas[n] for n in rows]
+        }
+
+    def query(self, query_texts, n_results: int = 10, where=None, include=None):
+        self._reload_if_changed()
+        snapshot = self._snapshot
+        all_ids, all_docs, all_metas, matrix = snapshot
+        rows = np.asarray(self._select(snapshot, where=where), dtype=np.int64)
+        result = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        queries = self._embed(query_texts) if len(query_texts) else []
+        for q in queries:
+            if rows.size == 0:
+                top = rows
+                scores = np.zeros(0, dtype=np.float32)
+            else:
+                scores = matrix[rows] @ q if where else matrix @ q
+                k = min(n_results, scores.shape[0])
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.argsort(-scores[top])]
+            picked = rows[top] if where else top
+            result["ids"].append([all_ids[n] for n in picked])
+            result["documents"].append([all_docs[n] for n in picked])
+            result["metadatas"].append([all_metas[n] for n in picked])
+            result["distances"].append([float(1.0 - scores[t]) for t in top])
+        return result
@@ -1,7 +1,10 @@
+import asyncio
 import json
 import logging
 import random
+from app.core.config import settings
 from app.services.llm_service import llm_service
+from app.core.rate_limit import PRIORITY_BACKGROUND
 from app.services.rag_service import rag_service
 from app.services.spotify_service import spotify_service
 
@@ -9,13 +12,38 @@ class PlannerAgent:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
-    def generate_plan(self, mood: str, intensity: float, user_id: int = None):
+    async def _run_branch(self, name: str, timeout: float, fn, *args, default=None, **kwargs):
+        # Runs one blocking dependency off the event loop; a slow or failing branch yields its default
+        try:
+            return await asyncio.wait_for(asyncio.to_thread(fn, *args, **kwargs), timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Planner branch '{name}' timed out after {timeout}s")
+        except Exception as e:
+            self.logger.error(f"Planner branch '{name}' failed: {e}")
+        return default
+
+    async def generate_plan(self, mood: str, intensity: float, user_id: int = None,
+                            time_available: int = None, preferences: dict = None):
         """
         Generates a 3-step improvement plan using RAG + LLM.
+        The RAG lookups run in parallel and the Spotify lookup starts
+        speculatively, so latency is bound by the slowest branch.
+        Activities never exceed the time budget; preferences switch them to hybrid retrieval.
         """
-        # 1. Retrieve Context from ChromaDB
-        relevant_activities = rag_service.query_activities(mood, n_results=3)
-        relevant_micro_tasks = rag_service.query_micro_tasks(mood, n_results=3)
+        # Speculative: most plans end up with a music step, fetch its playlist meanwhile
+        playlists_task = asyncio.create_task(self._run_branch(
+            "spotify", settings.PLANNER_SPOTIFY_TIMEOUT_SECONDS,
+            spotify_service.get_mood_playlists, mood, limit=1, default=[]
+        ))
+
+        # 1. Retrieve Context from ChromaDB (both collections at once)
+        relevant_activities, relevant_micro_tasks = await asyncio.gather(
+            self._run_branch("rag_activities", settings.PLANNER_RAG_TIMEOUT_SECONDS,
+                             rag_service.query_activities, mood, n_results=3,
+                             time_available=time_available, preferences=preferences, default=[]),
+            self._run_branch("rag_micro_tasks", settings.PLANNER_RAG_TIMEOUT_SECONDS,
+                             rag_service.query_micro_tasks, mood, n_results=3, default=[])
+        )
         
         context_str = f"Suggested Activities: {relevant_activities}\nSuggested Micro-tasks: {relevant_micro_tasks}"
         
@@ -34,8 +62,10 @@ Rules:
 5. Use the provided Context if relevant, but adapt it to be engaging.
 """
 
+        time_str = f"{time_available} minutes" if time_available else "not specified"
         user_prompt = f"""
 User Mood: {mood} (Intensity: {intensity})
+Time Available: {time_str}
 Context from Database:
 {context_str}
 
@@ -45,7 +75,11 @@ Generate the 3-step JSON plan now.
 
         # 3. Call LLM
         try:
-            response_text = llm_service.generate(system_prompt, user_prompt)
+            # A timeout here falls through to the smart fallback plan below
+            response_text = await asyncio.wait_for(
+                llm_service.generate(system_prompt, user_prompt, cache=True, priority=PRIORITY_BACKGROUND),
+                settings.PLANNER_LLM_TIMEOUT_SECONDS
+            )
             print(f"DEBUG LLM RAW: {response_text}")
             # Clean response to ensure valid JSON
             cleaned_text = response_text
@@ -68,7 +102,7 @@ Generate the 3-step JSON plan now.
             plan = parsed
 
         except Exception as e:
-            self.logger.error(f"Planner Agent failed: {e}")
+            self.logger.error(f"Planner Agent failed: {e!r}")
             # Smart Fallback
             step3_type = "music" if mood in ["sad", "sadness", "depressed", "anxious", "stress", "stressed"] else "affirmation"
             desc = "Listen to some healing frequencies." if step3_type == "music" else "You are doing your best."
@@ -89,9 +123,12 @@ Generate the 3-step JSON plan now.
                 })
 
         # 5. Inject Music Recommendation (Universal)
-        for step in plan:
-            if step.get("type") == "music":
-                playlists = spotify_service.get_mood_playlists(mood, limit=1)
+        music_steps = [step for step in plan if step.get("type") == "music"]
+        if not music_steps:
+            playlists_task.cancel()
+        else:
+            playlists = await playlists_task
+            for step in music_steps:
                 if playlists:
                     step["spotify_uri"] = playlists[0]["uri"]
                     step["description"] += f" (Try: {playlists[0]['name']})"
@@ -1,39 +1,97 @@
-import chromadb
-from chromadb.config import Settings
+from app.core.config import settings
+from app.services.vector_store import vector_store, ACTIVITIES_COLLECTION, MICRO_TASKS_COLLECTION
+from collections import Counter
 import logging
+import math
+import re
+import threading
 import uuid
 
+# Mood / emotion labels produced by mood detection; their retrievals are precomputed
+KNOWN_MOODS = [
+    "happy", "sad", "stressed", "anxious", "low_energy", "neutral",
+    "joy", "sadness", "anger", "fear", "optimism", "boredom", "bored", "exhaustion"
+]
+
+RRF_K = 60 # reciprocal rank fusion damping
+
+# Preference keys that narrow activity retrieval (see query_activities_hybrid)
+PREFERENCE_KEYS = ("types", "energy_level", "keywords")
+
+SEED_ACTIVITIES = [
+    {"text": "Quick desk stretches", "mood": "low_energy", "type": "activity", "time_minutes": 2},
+    {"text": "2-minute breathing reset", "mood": "stressed", "type": "breathing", "time_minutes": 2},
+    {"text": "Listen to a short upbeat track", "mood": "sad", "type": "music", "time_minutes": 4},
+    {"text": "Drink a glass of water", "mood": "neutral", "type": "activity", "time_minutes": 1},
+    {"text": "Do 10 jumping jacks", "mood": "boredom", "type": "activity", "time_minutes": 1},
+    {"text": "Write down 3 things you are grateful for", "mood": "sad", "type": "journal", "time_minutes": 5},
+    {"text": "Visualize your happy place for 60 seconds", "mood": "anxious", "type": "breathing", "time_minutes": 1}
+]
+
+def _tokenize(text: str):
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+def _bm25_scores(query: str, documents, k1: float = 1.5, b: float = 0.75):
+    # Okapi BM25 of one query against a small candidate set
+    docs = [_tokenize(d) for d in documents]
+    if not docs:
+        return []
+    avg_len = sum(len(d) for d in docs) / len(docs) or 1.0
+    df = Counter(term for d in docs for term in set(d))
+    scores = []
+    for d in docs:
+        tf = Counter(d)
+        score = 0.0
+        for term in set(_tokenize(query)):
+            if term not in tf:
+                continue
+            idf = math.log(1 + (len(docs) - df[term] + 0.5) / (df[term] + 0.5))
+            score += idf * tf[term] * (k1 + 1) / (tf[term] + k1 * (1 - b + b * len(d) / avg_len))
+        scores.append(score)
+    return scores
+
+def _where(conditions):
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
 class RAGService:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        # Persistent storage for ChromaDB
-        self.client = chromadb.PersistentClient(path="./chroma_db")
-        
-        # Get or Create Collections
-        self.activities_col = self.client.get_or_create_collection("activities")
-        self.micro_tasks_col = self.client.get_or_create_collection("micro_tasks")
-        
-        # Seed data if empty
-        if self.activities_col.count() == 0:
-            self.seed_data()
-            
+        # Collections come from the shared vector store on first use
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def _ensure_ready(self):
+        if self._ready:
+            return
+        with self._lock:
+            if not self._ready:
+                # Seed data if empty
+                if vector_store.activities().count() == 0:
+                    self.seed_data()
+                self._ready = True
+
+    @property
+    def activities_col(self):
+        self._ensure_ready()
+        return vector_store.activities()
+
+    @property
+    def micro_tasks_col(self):
+        self._ensure_ready()
+        return vector_store.micro_tasks()
+
     def seed_data(self):
         self.logger.info("Seeding ChromaDB with initial data...")
         
         # 1. Activities
-        activities = [
-            {"text": "Quick desk stretches", "mood": "low_energy", "type": "activity"},
-            {"text": "2-minute breathing reset", "mood": "stressed", "type": "breathing"},
-            {"text": "Listen to a short upbeat track", "mood": "sad", "type": "music"},
-            {"text": "Drink a glass of water", "mood": "neutral", "type": "activity"},
-            {"text": "Do 10 jumping jacks", "mood": "boredom", "type": "activity"},
-            {"text": "Write down 3 things you are grateful for", "mood": "sad", "type": "journal"},
-            {"text": "Visualize your happy place for 60 seconds", "mood": "anxious", "type": "breathing"}
-        ]
+        activities = SEED_ACTIVITIES
         
-        self.activities_col.add(
+        vector_store.add(
+            ACTIVITIES_COLLECTION,
             documents=[a["text"] for a in activities],
-            metadatas=[{"mood": a["mood"], "type": a["type"]} for a in activities],
+            metadatas=[{"mood": a["mood"], "type": a["type"], "time_minutes": a["time_minutes"]} for a in activities],
             ids=[str(uuid.uuid4()) for _ in activities]
         )
 
@@ -46,38 +104,140 @@ class RAGService:
             {"text": "Look out the window and spot a bird.", "mood": "boredom"}
         ]
         
-        self.micro_tasks_col.add(
+        vector_store.add(
+            MICRO_TASKS_COLLECTION,
             documents=[m["text"] for m in micro_tasks],
             metadatas=[{"mood": m["mood"]} for m in micro_tasks],
             ids=[str(uuid.uuid4()) for _ in micro_tasks]
         )
         self.logger.info("ChromaDB seeding complete.")
 
-    def query_activities(self, mood: str, n_results: int = 3):
-        # Query based on mood text (semantic search)
-        results = self.activities_col.query(
-            query_texts=[mood],
-            n_results=n_results
-            # We could also filter by metadata, e.g., where={"mood": mood}
-            # But semantic search is often better as it finds related concepts.
-        )
+    def _activity_item(self, doc: str, meta: dict):
+        item = {"description": doc, "type": meta.get("type", "activity")}
+        if meta.get("time_minutes") is not None:
+            item["time_minutes"] = meta["time_minutes"]
+        return item
+
+    def query_activities(self, mood: str, n_results: int = 3, time_available: int = None, preferences: dict = None):
+        preferences = preferences or {}
+        if any(preferences.get(k) for k in PREFERENCE_KEYS):
+            return self.query_activities_hybrid(mood, n_results, time_available, preferences)
+
+        # Query based on mood text (semantic search); known moods come from the retrieval table
+        self._ensure_ready()
+        results = vector_store.query(ACTIVITIES_COLLECTION, mood, n_results)
+        # We could also filter by metadata, e.g., where={"mood": mood}
+        # But semantic search is often better as it finds related concepts.
         # Flatten results
         items = []
         if results['documents']:
              for i, doc in enumerate(results['documents'][0]):
-                 meta = results['metadatas'][0][i]
-                 items.append({"description": doc, "type": meta.get("type", "activity")})
+                 items.append(self._activity_item(doc, results['metadatas'][0][i] or {}))
+
+        # The time budget is a hard limit. Activities without a known duration never fit it.
+        if time_available and any(item.get("time_minutes", time_available + 1) > time_available for item in items):
+            return self.query_activities_hybrid(mood, n_results, time_available, preferences)
         return items
 
+    def query_activities_hybrid(self, mood: str, n_results: int = 3, time_available: int = None, preferences: dict = None):
+        """
+        Metadata pre-filter, then the ANN top RAG_HYBRID_CANDIDATES inside it,
+        re-ranked by fusing the ANN order with BM25 over those same candidates
+        (reciprocal rank fusion). Filters are relaxed in order (mood, then
+        preferences) until enough candidates remain; the time budget is never
+        relaxed.
+
+        preferences may carry "types" (list of activity types), "energy_level"
+        and "keywords" (extra BM25 terms).
+        """
+        self._ensure_ready()
+        preferences = preferences or {}
+        time_filter = [{"time_minutes": {"$lte": time_available}}] if time_available else []
+        preference_filters = []
+        if preferences.get("types"):
+            preference_filters.append({"type": {"$in": list(preferences["types"])}})
+        if preferences.get("energy_level"):
+            preference_filters.append({"energy_level": preferences["energy_level"]})
+
+        tiers = [_where([{"mood": mood}] + preference_filters + time_filter)]
+        if preference_filters:
+            tiers.append(_where(preference_filters + time_filter))
+        tiers.append(_where(time_filter))
+
+        query = " ".join([mood] + list(preferences.get("keywords") or []))
+        for where in tiers:
+            # Semantic candidates, ranked over the whole filtered set
+            ann = vector_store.query(ACTIVITIES_COLLECTION, query, settings.RAG_HYBRID_CANDIDATES, where=where)
+            ids = ann["ids"][0] if ann["ids"] else []
+            if len(ids) >= n_results:
+                break
+        if not ids:
+            return []
+
+        documents, metadatas = ann["documents"][0], ann["metadatas"][0]
+        fused = Counter()
+        for rank, doc_id in enumerate(ids):
+            fused[doc_id] += 1.0 / (RRF_K + rank + 1)
+        # Keyword ranking of the same candidates, which also covers terms the embedding model misses
+        bm25 = _bm25_scores(query, documents)
+        ranked = sorted((s, i) for i, s in zip(ids, bm25) if s > 0)[::-1]
+        for rank, (_, doc_id) in enumerate(ranked):
+            fused[doc_id] += 1.0 / (RRF_K + rank + 1)
+
+        by_id = {i: (d, m or {}) for i, d, m in zip(ids, documents, metadatas)}
+        return [self._activity_item(*by_id[doc_id]) for doc_id, _ in fused.most_common(n_results)]
+
+    def backfill_activity_metadata(self, page_size: int = 500):
+        """
+        Adds the seed table's metadata (time_minutes, type) to seeded activities
+        indexed before it was stored. Returns (backfilled, still_missing), where
+        still_missing counts activities that still have no time_minutes.
+        """
+        self._ensure_ready()
+        seeds = {a["text"]: a for a in SEED_ACTIVITIES}
+        col = vector_store.activities()
+        ids, documents, metadatas = [], [], []
+        still_missing = offset = 0
+        while True:
+            page = col.get(limit=page_size, offset=offset, include=["documents", "metadatas"])
+            if not page["ids"]:
+                break
+            offset += len(page["ids"])
+            for doc_id, doc, meta in zip(page["ids"], page["documents"], page["metadatas"]):
+                meta = meta or {}
+                if meta.get("time_minutes") is not None:
+                    continue
+                seed = seeds.get(doc)
+                if seed is None:
+                    still_missing += 1
+                    continue
+                ids.append(doc_id)
+                documents.append(doc)
+                metadatas.append({**meta, "type": seed["type"], "time_minutes": seed["time_minutes"]})
+        if ids:
+            vector_store.upsert(ACTIVITIES_COLLECTION, ids=ids, documents=documents, metadatas=metadatas)
+        return len(ids), still_missing
+
     def query_micro_tasks(self, mood: str, n_results: int = 2):
-        results = self.micro_tasks_col.query(
-            query_texts=[mood],
-            n_results=n_results
-        )
+        self._ensure_ready()
+        results = vector_store.query(MICRO_TASKS_COLLECTION, mood, n_results)
         items = []
         if results['documents']:
              for i, doc in enumerate(results['documents'][0]):
                  items.append(doc)
         return items
 
+    def build_retrieval_table(self):
+        """
+        Precomputes top-k activities and micro-tasks for every known mood
+        (and every recommendation target mood), so per-request retrieval
+        for those is a dict lookup.
+        """
+        from app.services.recommendation import TARGET_MOOD_MAP
+        self._ensure_ready()
+        vector_store.precompute(ACTIVITIES_COLLECTION, KNOWN_MOODS, n_results=3)
+        vector_store.precompute(MICRO_TASKS_COLLECTION, KNOWN_MOODS, n_results=3)
+        vector_store.precompute(ACTIVITIES_COLLECTION, set(TARGET_MOOD_MAP.values()) | {"general"}, n_results=5)
+        self.logger.info("Retrieval table built.")
+
 rag_service = RAGService()
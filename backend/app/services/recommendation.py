@@ -1,30 +1,37 @@
 from app.services.chroma_service import chroma_service
 from app.services.microtask_agent import microtask_agent
 from app.services.llm_service import llm_service
+from app.core.rate_limit import PRIORITY_BACKGROUND
+import asyncio
 import random
+import re
+
+# Map detected mood to target content mood
+TARGET_MOOD_MAP = {
+    "boredom": "excitement",
+    "sadness": "comfort",
+    "joy": "joy",
+    "anger": "relaxation",
+    "fear": "calm",
+    "optimism": "productivity",
+     # labels from twitter-roberta
+     "joy": "celebration",
+     "sadness": "uplifting",
+     "anger": "calm",
+     "optimism": "progress",
+     "low_energy": "energizing"
+}
 
 class PlannerAgent:
-    def generate_plan(self, mood: str, intensity: float, time_minutes: int, preferences: dict):
-        # Map detected mood to target content mood
-        target_mood_map = {
-            "boredom": "excitement",
-            "sadness": "comfort",
-            "joy": "joy",
-            "anger": "relaxation",
-            "fear": "calm",
-            "optimism": "productivity",
-             # labels from twitter-roberta
-             "joy": "celebration",
-             "sadness": "uplifting",
-             "anger": "calm",
-             "optimism": "progress",
-             "low_energy": "energizing"
-        }
+    async def generate_plan(self, mood: str, intensity: float, time_minutes: int, preferences: dict):
         
-        target_query = target_mood_map.get(mood, "general")
+        target_query = TARGET_MOOD_MAP.get(mood, "general")
         
-        # Query Vector DB
-        activities = chroma_service.query_activities(query_text=target_query, n_results=5)
+        # Query Vector DB (sync client, off the event loop) while the affirmation is generated
+        activities, affirmation = await asyncio.gather(
+            asyncio.to_thread(chroma_service.query_activities, query_text=target_query, n_results=5),
+            self._generate_affirmation(mood)
+        )
         
         plan = []
         
@@ -73,14 +80,27 @@ class PlannerAgent:
         })
         
         # 5. Positive Affirmation (Generated by LLM)
+        plan.append({
+            "type": "affirmation",
+            "description": affirmation,
+            "time_minutes": 1
+        })
+        
+        return {
+            "plan": plan,
+            "source": "rag+llm_planner_agent"
+        }
+
+    async def _generate_affirmation(self, mood: str) -> str:
         try:
-             affirmation = llm_service.generate(
+             affirmation = await llm_service.generate(
                 system_prompt="You are a motivational coach. Generate a short, powerful affirmation (max 10 words) for someone feeling " + mood + ". Return ONLY the text, no quotes or tags.",
                 user_prompt="Generate affirmation",
-                model="mistralai/mistral-7b-instruct:free"
+                model="mistralai/mistral-7b-instruct:free",
+                cache=True, # Only varies by mood
+                priority=PRIORITY_BACKGROUND
              )
              # Clean response
-             import re
              if affirmation:
                  affirmation = re.sub(r'<[^>]+>|\[.*?\]', '', affirmation).strip().strip('"')
 
@@ -89,16 +109,6 @@ class PlannerAgent:
                  affirmation = "You are capable of amazing things."
         except:
              affirmation = "Small steps lead to big changes."
-
-        plan.append({
-            "type": "affirmation",
-            "description": affirmation,
-            "time_minutes": 1
-        })
-        
-        return {
-            "plan": plan,
-            "source": "rag+llm_planner_agent"
-        }
+        return affirmation
 
 planner_agent = PlannerAgent()
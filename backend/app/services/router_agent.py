@@ -8,36 +8,45 @@ class RouterAgent:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
-    def route(self, mood_data: dict, user_id: int):
+    def _plan_constraints(self, mood_data: dict) -> dict:
+        # Time budget and preferences narrow the planner's activity retrieval
+        return {
+            "time_available": mood_data.get("time_available_minutes"),
+            "preferences": mood_data.get("preferences")
+        }
+
+    async def route(self, mood_data: dict, user_id: int):
+        constraints = self._plan_constraints(mood_data)
         try:
-            items = self._route_logic(mood_data, user_id)
+            items = await self._route_logic(mood_data, user_id)
             if not items:
                 # Fallback if agent returned empty
-                return planner_agent.generate_plan(mood_data.get("mood"), 0.5, user_id)
+                return await planner_agent.generate_plan(mood_data.get("mood"), 0.5, user_id, **constraints)
             return items
         except Exception as e:
             self.logger.error(f"Router Error: {e}")
-            return planner_agent.generate_plan("neutral", 0.5, user_id)
+            return await planner_agent.generate_plan("neutral", 0.5, user_id, **constraints)
 
-    def _route_logic(self, mood_data: dict, user_id: int):
+    async def _route_logic(self, mood_data: dict, user_id: int):
         """
         Internal routing logic
         """
         mood = mood_data.get("mood", "neutral")
         emotion = mood_data.get("emotion", "neutral")
         intensity = mood_data.get("intensity", 0.5)
+        constraints = self._plan_constraints(mood_data)
 
         self.logger.info(f"Routing for Mood: {mood}, Emotion: {emotion}")
 
         # 1. Critical/Heavy Emotions -> Planner Agent (Needs structured help)
         if emotion in ["sadness", "anger", "fear", "exhaustion", "stressed", "anxious", "sad"]:
              self.logger.info("Selected Agent: PlannerAgent")
-             return planner_agent.generate_plan(mood, intensity, user_id)
+             return await planner_agent.generate_plan(mood, intensity, user_id, **constraints)
 
         # 2. Boredom -> Planner Agent (Full Plan: Micro-task + Activity + Music)
         elif emotion == "boredom":
              self.logger.info("Selected Agent: PlannerAgent (Boredom)")
-             return planner_agent.generate_plan(mood, intensity, user_id)
+             return await planner_agent.generate_plan(mood, intensity, user_id, **constraints)
 
         # 3. Neutral -> Surprise Agent (Spark joy)
         elif emotion == "neutral":
@@ -52,6 +61,6 @@ class RouterAgent:
         # 4. Happy/Optimism -> Planner Agent (Sustainability Plan)
         else:
              self.logger.info("Selected Agent: PlannerAgent (Default)")
-             return planner_agent.generate_plan(mood, intensity, user_id)
+             return await planner_agent.generate_plan(mood, intensity, user_id, **constraints)
 
 router_agent = RouterAgent()
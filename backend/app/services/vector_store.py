@@ -0,0 +1,155 @@
+import chromadb
+from chromadb.utils import embedding_functions
+from app.core.config import settings
+from app.services.embedding_cache import CachingEmbeddingFunction
+from app.services.numpy_index import NumpyCollection
+import logging
+import os
+import threading
+import time
+import uuid
+
+# One name per collection, shared by indexing (scripts/init_chroma.py) and retrieval
+ACTIVITIES_COLLECTION = "activities"
+MICRO_TASKS_COLLECTION = "micro_tasks"
+
+class VectorStore:
+    """
+    Shared Chroma access for every service: one lazily created persistent
+    client and one embedding function, so indexing and querying always see
+    the same collections and vectors.
+
+    Queries registered through precompute() (the known mood labels) are
+    answered from a retrieval table. Every write through a VectorStore
+    rewrites a per-collection version marker file next to the data, so the
+    table is invalidated on local writes and, within
+    RETRIEVAL_TABLE_CHECK_SECONDS, on writes from another process
+    (e.g. scripts/init_chroma.py upserting changed content).
+
+    With backend "numpy" the collections are NumpyCollection instances
+    and no Chroma client is opened.
+    """
+    def __init__(self, path: str = None, backend: str = None):
+        self.backend = backend or settings.VECTOR_BACKEND
+        if self.backend not in ("chroma", "numpy"):
+            raise ValueError(f"Unknown vector backend: {self.backend}")
+        default_path = settings.VECTOR_INDEX_DIR if self.backend == "numpy" else settings.CHROMA_PERSIST_DIR
+        self.path = path or default_path
+        self.logger = logging.getLogger(__name__)
+        self._client = None
+        self._embedding_fn = None
+        self._collections = {}
+        self._lock = threading.Lock()
+        # (collection, query_text, n_results) -> raw Chroma result
+        self._table = {}
+        self._table_queries = {}
+        self._table_versions = {}
+        self._table_checked = {}
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self.logger.info(f"Opening ChromaDB at {self.path}")
+                    self._client = chromadb.PersistentClient(path=self.path)
+        return self._client
+
+    @property
+    def embedding_fn(self):
+        if self._embedding_fn is None:
+            # Use default Sentence Transformer embedding, behind the embedding cache
+            self._embedding_fn = CachingEmbeddingFunction(
+                embedding_functions.DefaultEmbeddingFunction(),
+                max_size=settings.EMBEDDING_CACHE_SIZE,
+                directory=settings.EMBEDDING_CACHE_DIR
+            )
+        return self._embedding_fn
+
+    def collection(self, name: str):
+        col = self._collections.get(name)
+        if col is None:
+            if self.backend == "numpy":
+                col = NumpyCollection(name, self.path, self.embedding_fn)
+            else:
+                col = self.client.get_or_create_collection(name=name, embedding_function=self.embedding_fn)
+            self._collections[name] = col
+        return col
+
+    def add(self, name: str, **kwargs):
+        self.collection(name).add(**kwargs)
+        self._bump_version(name)
+        self.invalidate(name)
+
+    def upsert(self, name: str, **kwargs):
+        self.collection(name).upsert(**kwargs)
+        self._bump_version(name)
+        self.invalidate(name)
+
+    def _version_path(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.version")
+
+    def _bump_version(self, name: str):
+        # Write to a temp file and swap, so readers in other processes never see a partial marker
+        os.makedirs(self.path, exist_ok=True)
+        tmp = f"{self._version_path(name)}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(uuid.uuid4().hex)
+        os.replace(tmp, self._version_path(name))
+
+    def _version(self, name: str):
+        # Marker plus count; the count still catches writes that bypass VectorStore
+        try:
+            with open(self._version_path(name)) as f:
+                marker = f.read()
+        except OSError:
+            marker = ""
+        return marker, self.collection(name).count()
+
+    def invalidate(self, name: str):
+        with self._lock:
+            for key in [k for k in self._table if k[0] == name]:
+                del self._table[key]
+            self._table_versions.pop(name, None)
+            # Record the new baseline on the next lookup
+            self._table_checked.pop(name, None)
+
+    def _check_fresh(self, name: str):
+        # Cheap external-change detection, at most once per interval
+        now = time.monotonic()
+        if now - self._table_checked.get(name, float("-inf")) < settings.RETRIEVAL_TABLE_CHECK_SECONDS:
+            return
+        self._table_checked[name] = now
+        version = self._version(name)
+        if self._table_versions.get(name, version) != version:
+            self.logger.info(f"Collection '{name}' changed, dropping precomputed retrievals")
+            self.invalidate(name)
+            self._table_checked[name] = now
+        self._table_versions[name] = version
+
+    def query(self, name: str, query_text: str, n_results: int, where: dict = None):
+        key = (name, query_text, n_results)
+        if where is not None or query_text not in self._table_queries.get(name, ()):
+            # Free-text or filtered query: live vector search
+            return self.collection(name).query(query_texts=[query_text], n_results=n_results, where=where)
+
+        self._check_fresh(name)
+        result = self._table.get(key)
+        if result is None:
+            result = self.collection(name).query(query_texts=[query_text], n_results=n_results)
+            self._table[key] = result
+        return result
+
+    def precompute(self, name: str, query_texts, n_results: int):
+        # Registers query texts for table lookup and fills their top-k now
+        self._table_queries.setdefault(name, set()).update(query_texts)
+        for text in query_texts:
+            self.query(name, text, n_results)
+
+    def activities(self):
+        return self.collection(ACTIVITIES_COLLECTION)
+
+    def micro_tasks(self):
+        return self.collection(MICRO_TASKS_COLLECTION)
+
+vector_store = VectorStore()
@@ -0,0 +1,101 @@
+import sys
+import os
+import argparse
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.db.session import build_engine
+from app.models.chat import ChatHistory
+from app.models.mood import MoodHistory
+
+def run_profile(profile, writers, writes_per_worker, readers):
+    """
+    Mimics concurrent /chat/send and /mood/log writers (one commit per
+    request) with /history readers alongside, against a fresh database file.
+    """
+    directory = tempfile.mkdtemp(prefix=f"bench_db_{profile}_")
+    url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    try:
+        engine = build_engine(url, profile=profile)
+        read_engine = build_engine(url, profile=profile, read_only=True)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        ReadSession = sessionmaker(bind=read_engine)
+
+        errors = {"locked": 0}
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def writer(worker):
+            for n in range(writes_per_worker):
+                db = Session()
+                try:
+                    if n % 2:
+                        db.add(MoodHistory(user_id=worker, mood="happy", emotion="joy", intensity=0.8))
+                    else:
+                        db.add(ChatHistory(user_id=worker, session_id=f"s{worker}", role="user", message="hello"))
+                    db.commit()
+                except OperationalError:
+                    db.rollback()
+                    with lock:
+                        errors["locked"] += 1
+                finally:
+                    db.close()
+
+        def reader(worker):
+            reads = 0
+            while not done.is_set():
+                db = ReadSession()
+                try:
+                    db.query(MoodHistory).filter(MoodHistory.user_id == worker).order_by(MoodHistory.created_at.desc()).limit(20).all()
+                    reads += 1
+                except OperationalError:
+                    with lock:
+                        errors["locked"] += 1
+                finally:
+                    db.close()
+            return reads
+
+        with ThreadPoolExecutor(max_workers=writers + readers) as pool:
+            read_futures = [pool.submit(reader, r) for r in range(readers)]
+            start = time.perf_counter()
+            list(pool.map(writer, range(writers)))
+            elapsed = time.perf_counter() - start
+            done.set()
+            reads = sum(f.result() for f in read_futures)
+
+        total = writers * writes_per_worker
+        engine.dispose()
+        read_engine.dispose()
+        return {
+            "writes_per_s": (total - errors["locked"]) / elapsed,
+            "reads_per_s": reads / elapsed,
+            "locked": errors["locked"],
+            "elapsed_s": elapsed
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite write throughput: default engine vs tuned profile")
+    parser.add_argument("--writers", type=int, default=32)
+    parser.add_argument("--writes", type=int, default=50, help="Commits per writer")
+    parser.add_argument("--readers", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{args.writers} writers x {args.writes} commits, {args.readers} concurrent history readers")
+    print(f"{'Profile':<8} | {'Writes/s':>9} | {'Reads/s':>9} | {'Locked errors':>13} | {'Elapsed (s)':>11}")
+    print("-" * 62)
+    for profile in ("default", "tuned"):
+        s = run_profile(profile, args.writers, args.writes, args.readers)
+        print(f"{profile:<8} | {s['writes_per_s']:>9.0f} | {s['reads_per_s']:>9.0f} | {s['locked']:>13} | {s['elapsed_s']:>11.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import sys
+import os
+import argparse
+import random
+import shutil
+import statistics
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.services.rag_service import KNOWN_MOODS
+from app.services.vector_store import VectorStore, ACTIVITIES_COLLECTION
+
+CATEGORIES = ["Fitness", "Creativity", "Relaxation", "Fun", "Productivity", "Learning", "Social", "Music"]
+ACTIONS = ["Take a short walk", "Stretch for a few minutes", "Doodle something", "Call a friend",
+           "Tidy one drawer", "Listen to a calm song", "Read a short article", "Write a quick note"]
+
+def build_catalog(size):
+    rng = random.Random(42)
+    catalog = []
+    for n in range(size):
+        mood = rng.choice(KNOWN_MOODS)
+        category = rng.choice(CATEGORIES)
+        catalog.append((
+            str(n),
+            f"{mood} {category}: {rng.choice(ACTIONS)} #{n}",
+            {"mood": mood, "category": category, "time_minutes": rng.choice([1, 2, 5, 10, 15])}
+        ))
+    return catalog
+
+def benchmark_backend(backend, catalog, queries, repeats):
+    """
+    Indexes the catalog into a fresh store, then measures cold start
+    (new store + first query against the persisted data) and warm query latency.
+    """
+    directory = tempfile.mkdtemp(prefix=f"bench_{backend}_")
+    # Keep synthetic vectors out of the real embedding cache
+    settings.EMBEDDING_CACHE_DIR = os.path.join(directory, "embedding_cache")
+    try:
+        store = VectorStore(path=directory, backend=backend)
+        start = time.perf_counter()
+        for i in range(0, len(catalog), 500):
+            page = catalog[i:i + 500]
+            store.upsert(ACTIVITIES_COLLECTION, ids=[c[0] for c in page],
+                         documents=[c[1] for c in page], metadatas=[c[2] for c in page])
+        index_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cold = VectorStore(path=directory, backend=backend)
+        cold.collection(ACTIVITIES_COLLECTION).query(query_texts=[queries[0]], n_results=3)
+        cold_start = time.perf_counter() - start
+
+        col = cold.collection(ACTIVITIES_COLLECTION)
+        timings = []
+        results = {}
+        for _ in range(repeats):
+            for q in queries:
+                start = time.perf_counter()
+                res = col.query(query_texts=[q], n_results=3)
+                timings.append(time.perf_counter() - start)
+                results[q] = res["ids"][0]
+        timings.sort()
+        return {
+            "index_s": index_time,
+            "cold_start_ms": cold_start * 1000,
+            "p50_ms": statistics.median(timings) * 1000,
+            "p95_ms": timings[int(len(timings) * 0.95) - 1] * 1000,
+            "results": results
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Chroma and the in-process NumPy vector backend")
+    parser.add_argument("--size", type=int, default=1000, help="Synthetic catalog size")
+    parser.add_argument("--repeats", type=int, default=20, help="Passes over the known moods")
+    args = parser.parse_args()
+
+    catalog = build_catalog(args.size)
+    queries = list(KNOWN_MOODS)
+    stats = {backend: benchmark_backend(backend, catalog, queries, args.repeats) for backend in ("chroma", "numpy")}
+
+    print(f"Catalog: {args.size} activities, {len(queries) * args.repeats} queries per backend")
+    print(f"{'Backend':<8} | {'Index (s)':>9} | {'Cold start (ms)':>15} | {'p50 (ms)':>8} | {'p95 (ms)':>8}")
+    print("-" * 62)
+    for backend, s in stats.items():
+        print(f"{backend:<8} | {s['index_s']:>9.2f} | {s['cold_start_ms']:>15.1f} | {s['p50_ms']:>8.3f} | {s['p95_ms']:>8.3f}")
+
+    overlap = [len(set(stats["chroma"]["results"][q]) & set(stats["numpy"]["results"][q])) / 3 for q in queries]
+    print(f"Top-3 overlap with Chroma: {sum(overlap) / len(overlap):.1%}")
+
+if __name__ == "__main__":
+    main()
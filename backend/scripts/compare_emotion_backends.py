@@ -0,0 +1,58 @@
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.emotion_ai import EmotionAnalyzer
+from test_emotion_model import TEST_PHRASES
+
+def compare_backends():
+    """
+    Runs the PyTorch and the int8 ONNX backends over the phrases in
+    test_emotion_model.py and reports label agreement, score delta and latency.
+    """
+    reference = EmotionAnalyzer(backend="torch")
+    quantized = EmotionAnalyzer(backend="onnx")
+    reference.load_model()
+    quantized.load_model()
+
+    label_matches = 0
+    mood_matches = 0
+    deltas = []
+    timings = {"torch": 0.0, "onnx": 0.0}
+
+    print(f"{'Text':<50} | {'torch':<22} | {'onnx':<22} | {'Delta':<6}")
+    print("-" * 110)
+
+    for text in TEST_PHRASES:
+        start = time.perf_counter()
+        ref_scores = reference._classify_batch([text])[0]
+        timings["torch"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        q_scores = quantized._classify_batch([text])[0]
+        timings["onnx"] += time.perf_counter() - start
+
+        ref_top = max(ref_scores, key=lambda x: x['score'])
+        q_top = max(q_scores, key=lambda x: x['score'])
+        q_by_label = {r['label']: r['score'] for r in q_scores}
+        delta = max(abs(r['score'] - q_by_label.get(r['label'], 0.0)) for r in ref_scores)
+        deltas.append(delta)
+
+        if ref_top['label'] == q_top['label']:
+            label_matches += 1
+        if reference._postprocess(text, ref_scores)['mood'] == quantized._postprocess(text, q_scores)['mood']:
+            mood_matches += 1
+
+        print(f"{text[:50]:<50} | {ref_top['label']:<10} {ref_top['score']:.4f}     | {q_top['label']:<10} {q_top['score']:.4f}     | {delta:.4f}")
+
+    n = len(TEST_PHRASES)
+    print("-" * 110)
+    print(f"Top label agreement: {label_matches}/{n} ({label_matches / n:.1%})")
+    print(f"Final mood agreement: {mood_matches}/{n} ({mood_matches / n:.1%})")
+    print(f"Score delta: mean {sum(deltas) / n:.4f}, max {max(deltas):.4f}")
+    print(f"Latency per text: torch {timings['torch'] / n * 1000:.1f}ms, onnx {timings['onnx'] / n * 1000:.1f}ms")
+
+if __name__ == "__main__":
+    compare_backends()
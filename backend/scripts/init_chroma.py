@@ -1,36 +1,112 @@
 import sys
 import os
+import argparse
+import hashlib
+import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.db.session import SessionLocal
 from app.models.content import Activity, MicroTask
-from app.services.chroma_service import chroma_service
+from app.services.vector_store import vector_store, ACTIVITIES_COLLECTION, MICRO_TASKS_COLLECTION
+from app.services.rag_service import rag_service
 
-def init_vectors():
+DEFAULT_PAGE_SIZE = 500
+
+def activity_document(act):
+    # text to embed
+    text = f"{act.mood} {act.category}: {act.description}"
+    return text, {"mood": act.mood, "time_minutes": act.time_minutes, "energy_level": act.energy_level, "category": act.category}
+
+def microtask_document(mt):
+    text = f"{mt.mood} {mt.type}: {mt.micro_task}"
+    return text, {"mood": mt.mood, "time_seconds": mt.time_seconds}
+
+def content_hash(text, metadata):
+    payload = text + "|" + "|".join(f"{k}={metadata[k]}" for k in sorted(metadata))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def iter_pages(db, model, page_size):
+    # Keyset pagination on id, so memory stays flat for large catalogs
+    last_id = 0
+    while True:
+        rows = db.query(model).filter(model.id > last_id).order_by(model.id).limit(page_size).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+def index_table(db, model, collection_name, to_document, page_size=DEFAULT_PAGE_SIZE, force=False):
+    """
+    Streams rows page by page and bulk-upserts the ones whose updated_at or
+    content hash differ from what is stored in the collection. Each page is
+    embedded in one batch by the collection's embedding function.
+    """
+    collection = vector_store.collection(collection_name)
+    total = db.query(model).count()
+    seen = indexed = skipped = 0
+    start = time.perf_counter()
+
+    print(f"Indexing {total} rows into '{collection_name}'...")
+    for rows in iter_pages(db, model, page_size):
+        ids, documents, metadatas = [], [], []
+        for row in rows:
+            text, metadata = to_document(row)
+            # Chroma metadata values cannot be None
+            metadata = {k: v for k, v in metadata.items() if v is not None}
+            metadata["content_hash"] = content_hash(text, metadata)
+            metadata["updated_at"] = row.updated_at.isoformat() if row.updated_at else ""
+            ids.append(str(row.id))
+            documents.append(text)
+            metadatas.append(metadata)
+
+        if not force:
+            existing = collection.get(ids=ids, include=["metadatas"])
+            stored = {i: m or {} for i, m in zip(existing["ids"], existing["metadatas"])}
+            changed = [
+                n for n, (i, m) in enumerate(zip(ids, metadatas))
+                if stored.get(i, {}).get("content_hash") != m["content_hash"]
+                or stored.get(i, {}).get("updated_at") != m["updated_at"]
+            ]
+        else:
+            changed = list(range(len(ids)))
+
+        if changed:
+            vector_store.upsert(
+                collection_name,
+                ids=[ids[n] for n in changed],
+                documents=[documents[n] for n in changed],
+                metadatas=[metadatas[n] for n in changed]
+            )
+
+        seen += len(rows)
+        indexed += len(changed)
+        skipped += len(rows) - len(changed)
+        elapsed = time.perf_counter() - start
+        print(f"  {seen}/{total} rows | {indexed} upserted, {skipped} unchanged | {seen / elapsed:.0f} rows/s")
+
+    elapsed = time.perf_counter() - start
+    print(f"Done '{collection_name}': {indexed} upserted, {skipped} unchanged in {elapsed:.1f}s")
+
+def init_vectors(page_size=DEFAULT_PAGE_SIZE, force=False):
     db = SessionLocal()
-    activities = db.query(Activity).all()
-    microtasks = db.query(MicroTask).all()
-    
-    print(f"Indexing {len(activities)} activities...")
-    for act in activities:
-        # text to embed
-        text = f"{act.mood} {act.category}: {act.description}"
-        chroma_service.add_activity(
-            activity_id=act.id,
-            text=text,
-            metadata={"mood": act.mood, "time_minutes": act.time_minutes}
-        )
-        
-    print(f"Indexing {len(microtasks)} microtasks...")
-    for mt in microtasks:
-        text = f"{mt.mood} {mt.type}: {mt.micro_task}"
-        chroma_service.add_microtask(
-            task_id=mt.id,
-            text=text,
-            metadata={"mood": mt.mood, "time_seconds": mt.time_seconds}
-        )
-        
+    try:
+        index_table(db, Activity, ACTIVITIES_COLLECTION, activity_document, page_size, force)
+        index_table(db, MicroTask, MICRO_TASKS_COLLECTION, microtask_document, page_size, force)
+    finally:
+        db.close()
+
+    # Rows indexed before time budgets were supported are re-upserted above (their hash changed);
+    # seeded activities are not in the database, so their metadata is filled in here
+    backfilled, missing = rag_service.backfill_activity_metadata(page_size)
+    print(f"Backfilled metadata on {backfilled} seeded activities")
+    if missing:
+        print(f"  {missing} activities still have no time_minutes and will never match a time budget")
+
     print("Vector DB initialized.")
 
 if __name__ == "__main__":
-    init_vectors()
+    parser = argparse.ArgumentParser(description="Incrementally index activities and micro-tasks into ChromaDB")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Rows per page / upsert batch")
+    parser.add_argument("--full", action="store_true", help="Re-embed every row, ignoring stored hashes")
+    args = parser.parse_args()
+    init_vectors(page_size=args.page_size, force=args.full)
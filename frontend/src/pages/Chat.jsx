@@ -18,8 +18,9 @@ export default function Chat() {
             try {
                 // Fetch last session if any, or just all history for user
                 const res = await axios.get(`http://localhost:8000/api/chat/history?user_id=${user.id}&limit=20`);
-                if (res.data && res.data.length > 0) {
-                    setMessages(res.data.map(m => ({ id: m.id, role: m.role === 'assistant' ? 'ai' : 'user', text: m.message })));
+                // Latest page of messages, oldest first
+                if (res.data && res.data.items.length > 0) {
+                    setMessages(res.data.items.map(m => ({ id: m.id, role: m.role === 'assistant' ? 'ai' : 'user', text: m.message })));
                 } else {
                     setMessages([{ id: 0, role: 'ai', text: "Hello! I noticed you might be feeling a bit low today. Want to talk about it?" }]);
                 }
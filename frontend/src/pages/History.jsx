@@ -19,11 +19,12 @@ export default function History() {
         const fetchHistory = async () => {
             try {
                 const res = await axios.get(`http://localhost:8000/api/mood/history?user_id=${user.id}`);
-                setHistory(res.data);
+                const items = res.data.items;
+                setHistory(items);
 
                 // Calculate Stats
-                const total = res.data.length;
-                const moods = res.data.map(i => i.mood);
+                const total = items.length;
+                const moods = items.map(i => i.mood);
                 const topMood = moods.sort((a, b) =>
                     moods.filter(v => v === a).length - moods.filter(v => v === b).length
                 ).pop() || "N/A";
@@ -19,7 +19,7 @@ export default function Journal() {
     const fetchEntries = async () => {
         try {
             const res = await axios.get(`http://localhost:8000/api/journal/list?user_id=${user.id}`);
-            setEntries(res.data.map(e => ({
+            setEntries(res.data.items.map(e => ({
                 id: e.id,
                 title: e.title,
                 preview: e.content.slice(0, 30) + "...",
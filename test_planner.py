@@ -1,4 +1,5 @@
 from app.services.planner_agent import planner_agent
+import asyncio
 import logging
 
 # Configure logging to see what's happening
@@ -6,7 +7,7 @@ logging.basicConfig(level=logging.INFO)
 
 print("Testing Planner Agent for mood='stressed'...")
 try:
-    plan = planner_agent.generate_plan(mood="stressed", intensity=0.8)
+    plan = asyncio.run(planner_agent.generate_plan(mood="stressed", intensity=0.8))
     print("\n--- PLAN GENERATED ---")
     import json
     print(json.dumps(plan, indent=2))
@@ -0,0 +1,72 @@
+import sys
+import os
+import tempfile
+
+# Add backend to path to allow imports
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from sqlalchemy import delete, text
+from sqlalchemy.orm import Session
+from datetime import datetime
+from app.api.v1.endpoints import auth, chat, journal, mood
+from app.core.pagination import encode_cursor
+from app.db.migrate import upgrade_database
+from app.db.session import build_engine
+from app.models.token import RefreshToken
+
+CURSOR = encode_cursor(datetime(2024, 1, 1, 12, 0, 0), 100)
+
+def hot_queries(db):
+    # The statements behind the hot endpoints, built by the endpoints' own query helpers
+    token_query = auth.refresh_token_query(db, "token")
+    return {
+        "mood/history": mood.history_query(1, None, 20),
+        "chat/history (all sessions)": chat.history_query(1, None, None, 50),
+        "chat/history (session)": chat.history_query(1, "s1", None, 50),
+        "journal/list": journal.list_query(1, None, 20),
+        # Keyset pages after the first one
+        "mood/history (cursor)": mood.history_query(1, CURSOR, 20),
+        "chat/history (cursor)": chat.history_query(1, None, CURSOR, 50),
+        "chat/history (session, cursor)": chat.history_query(1, "s1", CURSOR, 50),
+        "journal/list (cursor)": journal.list_query(1, CURSOR, 20),
+        "auth/refresh": token_query.statement,
+        # Query.delete() executes immediately, so compile the same filter as a DELETE
+        "auth/logout": delete(RefreshToken).where(token_query.whereclause),
+    }
+
+def query_plans():
+    """
+    Migrates a fresh SQLite database to head and returns the
+    EXPLAIN QUERY PLAN rows for every hot query.
+    """
+    directory = tempfile.mkdtemp()
+    url = f"sqlite:///{os.path.join(directory, 'plans.db')}"
+    upgrade_database(url)
+    engine = build_engine(url, profile="default")
+    plans = {}
+    with engine.connect() as conn, Session(engine) as db:
+        for name, stmt in hot_queries(db).items():
+            sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+            plans[name] = [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+    engine.dispose()
+    return plans
+
+def plan_problems(plan):
+    # "SCAN <table>" (with or without "USING INDEX") walks the whole table or index;
+    # "USE TEMP B-TREE" means the index doesn't cover the ORDER BY and rows get sorted
+    return [step for step in plan if step.startswith("SCAN") or "USE TEMP B-TREE" in step]
+
+def test_hot_queries_use_indexes():
+    for name, plan in query_plans().items():
+        assert not plan_problems(plan), f"{name} does a full scan or sort: {plan}"
+
+if __name__ == "__main__":
+    plans = query_plans()
+    failed = 0
+    for name, plan in plans.items():
+        problems = plan_problems(plan)
+        status = "❌ SCAN/SORT" if problems else "✅"
+        print(f"{status} {name}: {' | '.join(plan)}")
+        failed += bool(problems)
+    print(f"\n{len(plans) - failed}/{len(plans)} hot queries use an index without sorting")
+    sys.exit(1 if failed else 0)
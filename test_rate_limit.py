@@ -0,0 +1,44 @@
+import sys
+import os
+import asyncio
+
+# Add backend to path to allow imports
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app.core.rate_limit import RateGovernor, PRIORITY_INTERACTIVE
+
+async def cancel_after_grant():
+    """
+    A queued waiter is granted the only slot and cancelled before it resumes
+    (a client disconnecting from a streamed chat). Returns in_flight once the
+    dust settles and whether a fresh acquire still gets through.
+    """
+    governor = RateGovernor(rate_per_second=1000, burst=10, max_in_flight=1)
+    assert await governor.acquire(PRIORITY_INTERACTIVE, 1.0)
+
+    waiter = asyncio.create_task(governor.acquire(PRIORITY_INTERACTIVE, 1.0))
+    await asyncio.sleep(0) # waiter is queued
+    governor.release() # grants the slot to the waiter...
+    waiter.cancel() # ...which is cancelled before it runs
+    try:
+        granted = await waiter
+    except asyncio.CancelledError:
+        granted = False
+    if granted:
+        # Before Python 3.12, wait_for hands over the result despite the cancel
+        governor.release()
+
+    in_flight = governor.in_flight
+    next_acquire = await governor.acquire(PRIORITY_INTERACTIVE, 0.1)
+    return in_flight, next_acquire
+
+def test_cancelled_waiter_releases_granted_slot():
+    in_flight, next_acquire = asyncio.run(cancel_after_grant())
+    assert in_flight == 0, "cancelled waiter leaked its slot"
+    assert next_acquire, "governor stayed saturated after a cancelled waiter"
+
+if __name__ == "__main__":
+    in_flight, next_acquire = asyncio.run(cancel_after_grant())
+    ok = in_flight == 0 and next_acquire
+    print(f"{'✅' if ok else '❌'} cancelled waiter: in_flight={in_flight}, next acquire={'ok' if next_acquire else 'rejected'}")
+    sys.exit(0 if ok else 1)